@@ -68,7 +68,19 @@ So, for these example lists, the similarity score at the end of this process is
 Once again consider your left and right lists. What is their similarity score?
 """
 
+import itertools
 import os.path
+import random
+import tempfile
+from collections import Counter
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+# Inputs larger than this are solved out of core, with sorted runs spilled to disk
+STREAMING_THRESHOLD = 2**30
+# Number of lines sorted in memory at once by the streaming mode
+CHUNK_SIZE = 1_000_000
 
 
 def read_input(file_path: str) -> tuple[list, list]:
@@ -90,24 +102,265 @@ def read_input(file_path: str) -> tuple[list, list]:
     return sorted(left_list), sorted(right_list)
 
 
-def compute_distance(list_1: list[int], list_2: list[int]) -> int:
+def read_input_numpy(file_path: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Same as `read_input`, returning two sorted int64 arrays.
+    """
+
+    assert os.path.exists(file_path), f"File not found: {file_path}"
+    with open(file_path, "r") as file:
+        numbers = np.array(file.read().split(), dtype=np.int64).reshape(-1, 2)
+
+    return np.sort(numbers[:, 0]), np.sort(numbers[:, 1])
+
+
+def compute_distance(left: np.ndarray, right: np.ndarray) -> int:
     """
     Compute the total distance between the two lists.
     The distance is the sum of the absolute difference between each pair of numbers.
     """
-    return sum(abs(a - b) for a, b in zip(list_1, list_2))
+    return int(np.abs(left - right).sum())
+
+
+def compute_similarity(left: np.ndarray, right: np.ndarray) -> int:
+    """
+    Compute the similarity score: each number of the left list multiplied by
+    the number of times it appears in the right list.
+
+    The occurrences are counted once with np.unique, then looked up with a
+    binary search, so the score costs O(n log n) instead of O(n * m).
+    """
+    values, counts = np.unique(right, return_counts=True)
+    if len(values) == 0:
+        return 0
+
+    indices = np.searchsorted(values, left)
+    indices[indices == len(values)] = 0
+    found = values[indices] == left
+    return int((left[found] * counts[indices[found]]).sum())
+
+
+def compute_similarity_counter(left_list: list[int], right_list: list[int]) -> int:
+    """
+    Pure Python version of `compute_similarity`.
+    """
+    occurrences = Counter(right_list)
+    return sum(number * occurrences[number] for number in left_list)
+
+
+def spill_sorted_runs(
+    file_path: str, directory: str, chunk_size: int = CHUNK_SIZE
+) -> list[str]:
+    """
+    Read the input file `chunk_size` lines at a time and save each chunk as a
+    sorted int64 .npy run in `directory`. Return the paths of the runs.
+
+    Both columns go to the same run, each number encoded as a key
+    `2 * number + side`, with side 0 for the left list and 1 for the right
+    list, so that sorting the keys sorts the numbers.
+    """
+    run_paths = []
+    with open(file_path, "r") as file:
+        for i in itertools.count():
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines:
+                break
+            numbers = np.array("".join(lines).split(), dtype=np.int64).reshape(-1, 2)
+            keys = np.concatenate([2 * numbers[:, 0], 2 * numbers[:, 1] + 1])
+            run_path = os.path.join(directory, f"run_{i}.npy")
+            np.save(run_path, np.sort(keys))
+            run_paths.append(run_path)
+
+    return run_paths
+
+
+def merge_runs(
+    run_paths: list[str], block_size: int = CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    K-way merge of sorted runs, yielding sorted blocks of at most `block_size`
+    values.
+
+    Each run is memory-mapped and read `block_size // len(runs)` values at a
+    time. Every value up to the smallest last buffered value of the runs that
+    are not exhausted can be emitted, since no later value can be smaller.
+    """
+    runs = [np.load(run_path, mmap_mode="r") for run_path in run_paths]
+    run_block_size = max(block_size // max(len(runs), 1), 1)
+    offsets = [min(run_block_size, len(run)) for run in runs]
+    buffers = [np.asarray(run[:offset]) for run, offset in zip(runs, offsets)]
+
+    while any(len(buffer) for buffer in buffers):
+        bounds = [
+            buffer[-1]
+            for buffer, run, offset in zip(buffers, runs, offsets)
+            if len(buffer) and offset < len(run)
+        ]
+        bound = min(bounds) if bounds else None
+
+        parts = []
+        for i, buffer in enumerate(buffers):
+            n = (
+                len(buffer)
+                if bound is None
+                else np.searchsorted(buffer, bound, "right")
+            )
+            parts.append(buffer[:n])
+            buffers[i] = buffer[n:]
+            if len(buffers[i]) == 0 and offsets[i] < len(runs[i]):
+                buffers[i] = np.asarray(
+                    runs[i][offsets[i] : offsets[i] + run_block_size]
+                )
+                offsets[i] += len(buffers[i])
+
+        yield np.sort(np.concatenate(parts))
+
+
+class StreamingDistance:
+    """
+    Total distance of the sorted lists, from their merged stream.
+
+    The sum of |left[i] - right[i]| over the sorted lists is also the area
+    between their counting functions: between two consecutive numbers of the
+    stream, it grows by the gap times the number of left numbers seen minus
+    the number of right numbers seen. So the distance needs no pairing by
+    position.
+    """
+
+    total: int
+    last_value: Optional[int]
+    balance: int
+
+    def __init__(self):
+        self.total = 0
+        self.last_value = None
+        self.balance = 0
+
+    def update(self, values: np.ndarray, is_left: np.ndarray) -> None:
+        balances = self.balance + np.cumsum(np.where(is_left, 1, -1))
+        previous_values = np.concatenate(
+            [[values[0] if self.last_value is None else self.last_value], values[:-1]]
+        )
+        previous_balances = np.concatenate([[self.balance], balances[:-1]])
+        self.total += int(
+            (np.abs(previous_balances) * (values - previous_values)).sum()
+        )
+        self.last_value, self.balance = int(values[-1]), int(balances[-1])
+
+    @property
+    def result(self) -> int:
+        return self.total
+
+
+class StreamingSimilarity:
+    """
+    Similarity score of the lists, from their merged stream: each number
+    times its number of occurrences in each list. The counts of the last
+    number of a block are carried over, since it may continue in the next one.
+    """
+
+    total: int
+    carry: Optional[tuple[int, int, int]]
+
+    def __init__(self):
+        self.total = 0
+        self.carry = None
+
+    def update(self, values: np.ndarray, is_left: np.ndarray) -> None:
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        left_counts = np.bincount(inverse[is_left], minlength=len(unique_values))
+        right_counts = np.bincount(inverse[~is_left], minlength=len(unique_values))
+
+        if self.carry is not None:
+            value, left_count, right_count = self.carry
+            if value == unique_values[0]:
+                left_counts[0] += left_count
+                right_counts[0] += right_count
+            else:
+                self.total += value * left_count * right_count
+
+        self.total += int(
+            (unique_values[:-1] * left_counts[:-1] * right_counts[:-1]).sum()
+        )
+        self.carry = (
+            int(unique_values[-1]),
+            int(left_counts[-1]),
+            int(right_counts[-1]),
+        )
+
+    @property
+    def result(self) -> int:
+        if self.carry is None:
+            return self.total
+        value, left_count, right_count = self.carry
+        return self.total + value * left_count * right_count
+
+
+def compute_score_streaming(
+    file_path: str,
+    score: Union[StreamingDistance, StreamingSimilarity],
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Compute a score with memory bounded by the chunk size, for inputs that do
+    not fit in memory.
+
+    The sorted runs of both lists are spilled to disk, then merged once into a
+    single sorted stream that is fed to the score block by block.
+    """
+    assert os.path.exists(file_path), f"File not found: {file_path}"
+    with tempfile.TemporaryDirectory(prefix="aoc_day_1_") as directory:
+        run_paths = spill_sorted_runs(file_path, directory, chunk_size)
+        for keys in merge_runs(run_paths, chunk_size):
+            score.update(keys >> 1, (keys & 1) == 0)
+
+    return score.result
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate `size` lines of location IDs, with many IDs shared by both lists.
+    """
+    rng = random.Random(seed)
+    return "".join(
+        f"{rng.randint(10000, 10000 + size)}   {rng.randint(10000, 10000 + size)}\n"
+        for _ in range(size)
+    )
 
 
 def part_1(file_path: str) -> int:
+    if os.path.getsize(file_path) > STREAMING_THRESHOLD:
+        return part_1_streaming(file_path)
+    left, right = read_input_numpy(file_path)
+    return compute_distance(left, right)
+
+
+def part_1_streaming(file_path: str) -> int:
+    return compute_score_streaming(file_path, StreamingDistance())
+
+
+def part_1_lists(file_path: str) -> int:
     left_list, right_list = read_input(file_path)
-    return compute_distance(left_list, right_list)
+    return sum(abs(a - b) for a, b in zip(left_list, right_list))
 
 
 def part_2(file_path: str) -> int:
+    if os.path.getsize(file_path) > STREAMING_THRESHOLD:
+        return part_2_streaming(file_path)
+    left, right = read_input_numpy(file_path)
+    return compute_similarity(left, right)
+
+
+def part_2_streaming(file_path: str) -> int:
+    return compute_score_streaming(file_path, StreamingSimilarity())
+
+
+def part_2_counter(file_path: str) -> int:
     left_list, right_list = read_input(file_path)
-    similarity_score = 0
+    return compute_similarity_counter(left_list, right_list)
 
-    for number in left_list:
-        similarity_score += right_list.count(number) * number
 
-    return similarity_score
+IMPLEMENTATIONS = {
+    1: {"lists": part_1_lists, "numpy": part_1, "streaming": part_1_streaming},
+    2: {"counter": part_2_counter, "numpy": part_2, "streaming": part_2_streaming},
+}
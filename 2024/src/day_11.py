@@ -56,6 +56,13 @@ Consider the arrangement of stones in front of you. How many stones will you hav
 # Path: src/day_11.py
 # --- Part One ---
 
+import random
+
+import numpy as np
+
+# 10, 100, ..., 10**18: a stone has k digits when exactly k - 1 of them are <= it
+POWERS_OF_TEN = 10 ** np.arange(1, 19, dtype=np.int64)
+
 
 def stone_blink(stone_value: int) -> dict[int, int]:
     if stone_value == 0:
@@ -97,6 +104,53 @@ def blink(stones: dict[int, int]) -> dict[int, int]:
     return new_stones
 
 
+def blink_numpy(
+    values: np.ndarray, counts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised version of `blink` over parallel arrays of stone values and counts.
+    """
+    digits = np.searchsorted(POWERS_OF_TEN, values, side="right") + 1
+    is_zero = values == 0
+    is_even = ~is_zero & (digits % 2 == 0)
+    is_other = ~is_zero & ~is_even
+
+    divisor = 10 ** (digits[is_even] // 2)
+    new_values = np.concatenate(
+        [
+            np.ones(is_zero.sum(), dtype=np.int64),
+            values[is_even] // divisor,
+            values[is_even] % divisor,
+            values[is_other] * 2024,
+        ]
+    )
+    new_counts = np.concatenate(
+        [counts[is_zero], counts[is_even], counts[is_even], counts[is_other]]
+    )
+
+    # merge identical stones
+    unique_values, inverse = np.unique(new_values, return_inverse=True)
+    unique_counts = np.zeros(len(unique_values), dtype=np.int64)
+    np.add.at(unique_counts, inverse, new_counts)
+    return unique_values, unique_counts
+
+
+def count_stones_numpy(stones: dict[int, int], n_blinks: int) -> int:
+    values = np.array(list(stones.keys()), dtype=np.int64)
+    counts = np.array(list(stones.values()), dtype=np.int64)
+    for _ in range(n_blinks):
+        values, counts = blink_numpy(values, counts)
+    return sum(counts.tolist())
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate a line of `size` random stones.
+    """
+    rng = random.Random(seed)
+    return " ".join(str(rng.randint(0, 10**6)) for _ in range(size)) + "\n"
+
+
 def part_1(file_path: str) -> int:
     """
     Read the input file and return the solution.
@@ -121,3 +175,17 @@ def part_2(file_path: str) -> int:
     for i in range(75):
         stones = blink(stones)
     return sum(stones.values())
+
+
+def part_1_numpy(file_path: str) -> int:
+    return count_stones_numpy(load_input(file_path), 25)
+
+
+def part_2_numpy(file_path: str) -> int:
+    return count_stones_numpy(load_input(file_path), 75)
+
+
+IMPLEMENTATIONS = {
+    1: {"reference": part_1, "numpy": part_1_numpy},
+    2: {"reference": part_2, "numpy": part_2_numpy},
+}
@@ -53,6 +53,9 @@ Update your analysis by handling situations where the Problem Dampener can remov
 
 """
 
+import random
+
+import numpy as np
 from loguru import logger
 
 
@@ -91,12 +94,78 @@ def is_safe(report: list[int]) -> bool:
     return False
 
 
+def read_input_padded(file_path: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read the input file into a (reports, max levels) int64 array padded with
+    zeros, along with the number of levels of each report.
+    """
+    with open(file_path, "r") as file:
+        data = file.read()
+
+    # a level starts at each non-blank character that follows a blank one
+    raw = np.frombuffer(data.encode(), dtype=np.uint8)
+    is_newline = raw == ord("\n")
+    is_blank = is_newline | (raw == ord(" ")) | (raw == ord("\t")) | (raw == ord("\r"))
+    is_start = ~is_blank & np.concatenate([[True], is_blank[:-1]])
+
+    n_reports = int(is_newline.sum()) + int(len(raw) > 0 and not is_newline[-1])
+    report_index = np.cumsum(is_newline)[is_start]
+    lengths = np.bincount(report_index, minlength=n_reports)
+
+    levels = np.zeros((n_reports, max(lengths.max(initial=0), 1)), dtype=np.int64)
+    mask = np.arange(levels.shape[1]) < lengths[:, None]
+    levels[mask] = np.fromstring(data, dtype=np.int64, sep=" ")
+
+    return levels, lengths
+
+
+def are_safe(levels: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Vectorised version of `is_safe` over a padded batch of reports.
+
+    The first differences are computed once. A report is safe if every
+    difference within its length is in [1, 3], or every one is in [-3, -1].
+    """
+    differences = np.diff(levels, axis=1)
+    in_report = np.arange(differences.shape[1]) < (lengths - 1)[:, None]
+
+    increasing = ((differences >= 1) & (differences <= 3)) | ~in_report
+    decreasing = ((differences <= -1) & (differences >= -3)) | ~in_report
+
+    return increasing.all(axis=1) | decreasing.all(axis=1)
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate `size` reports, most of them monotonic with a few bad levels.
+    """
+    rng = random.Random(seed)
+    reports = []
+    for _ in range(size):
+        direction = rng.choice([-1, 1])
+        report = [rng.randint(10, 90)]
+        for _ in range(rng.randint(1, 9)):
+            step = (
+                rng.choice([1, 2, 3, 3, 0, 4])
+                if rng.random() < 0.2
+                else rng.randint(1, 3)
+            )
+            report.append(report[-1] + direction * step)
+        reports.append(" ".join(map(str, report)))
+    return "\n".join(reports) + "\n"
+
+
 def part_1(file_path: str) -> int:
     """
     Count the number of safe reports.
     A report is safe if the levels are either all increasing or all decreasing
     and any two adjacent levels differ by at least one and at most three.
     """
+    levels, lengths = read_input_padded(file_path)
+    return int(are_safe(levels, lengths).sum())
+
+
+def part_1_loop(file_path: str) -> int:
     reports = read_input(file_path)
     safe_reports = 0
     for report in reports:
@@ -106,6 +175,23 @@ def part_1(file_path: str) -> int:
     return safe_reports
 
 
+def find_bad_step(report: list[int], sign: int, skip: int = -1) -> int:
+    """
+    Return the index of the first level whose step from the previous kept level
+    is not in [1, 3] in the direction `sign`, ignoring the level at `skip`.
+    Return -1 if every step is valid.
+    """
+    previous = None
+    for i, level in enumerate(report):
+        if i == skip:
+            continue
+        if previous is not None and not 1 <= (level - previous) * sign <= 3:
+            return i
+        previous = level
+
+    return -1
+
+
 def is_safe_with_dampener(report: list[int]) -> bool:
     """
     A report is safe if:
@@ -113,28 +199,66 @@ def is_safe_with_dampener(report: list[int]) -> bool:
     - Any two adjacent levels differ by at least one and at most three.
 
     If the report is not safe, check if removing a single level makes it safe.
+    For a given direction, one of the two levels around the first bad step
+    must be removed, so only those two candidates are checked, in O(k) each
+    and without copying the report.
     """
 
-    if len(report) < 2:
-        return True
+    for sign in (1, -1):
+        bad = find_bad_step(report, sign)
+        if bad == -1:
+            return True
+        if find_bad_step(report, sign, skip=bad - 1) == -1:
+            return True
+        if find_bad_step(report, sign, skip=bad) == -1:
+            return True
 
-    if is_safe(report):
-        return True
+    return False
 
-    dampened_report: list[int] = []
-    for i in range(len(report)):
-        if i == 0:
-            dampened_report = report[i + 1 :]
-        if i == len(report) - 1:
-            dampened_report = report[:i]
-        if i > 0 and i < len(report) - 1:
-            dampened_report = report[:i] + report[i + 1 :]
 
-        if is_safe(dampened_report):
-            return True
+def are_safe_with_dampener(levels: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Vectorised version of `is_safe_with_dampener` over a padded batch of reports.
 
-    logger.warning(f"Report {report} is not safe.")
-    return False
+    For each direction, find the first bad step of every report and check the
+    removal of either of its two levels: every step after the removed level
+    must be valid (suffix of the valid steps) and so must the step bridging
+    its two neighbours.
+    """
+    n_reports, width = levels.shape
+    if width < 2:
+        return np.ones(n_reports, dtype=bool)
+
+    differences = np.diff(levels, axis=1)
+    n_steps = differences.shape[1]
+    in_report = np.arange(n_steps) < (lengths - 1)[:, None]
+    rows = np.arange(n_reports)
+
+    safe = np.zeros(n_reports, dtype=bool)
+    for sign in (1, -1):
+        steps = differences * sign
+        valid = ((steps >= 1) & (steps <= 3)) | ~in_report
+
+        # valid_after[:, t] is True when every step from t onwards is valid
+        valid_after = np.ones((n_reports, n_steps + 1), dtype=bool)
+        valid_after[:, :-1] = np.logical_and.accumulate(valid[:, ::-1], axis=1)[:, ::-1]
+
+        has_bad = ~valid_after[:, 0]
+        safe |= ~has_bad
+        first_bad = np.argmin(valid, axis=1)
+
+        # step t goes from level t to level t + 1
+        for removed in (first_bad, first_bad + 1):
+            rest_valid = valid_after[rows, np.minimum(removed + 1, n_steps)]
+            has_bridge = (removed > 0) & (removed + 1 < lengths)
+            bridge = (
+                levels[rows, np.minimum(removed + 1, width - 1)]
+                - levels[rows, np.maximum(removed - 1, 0)]
+            ) * sign
+            bridge_valid = ~has_bridge | ((bridge >= 1) & (bridge <= 3))
+            safe |= has_bad & rest_valid & bridge_valid
+
+    return safe
 
 
 def part_2(file_path: str) -> int:
@@ -143,6 +267,13 @@ def part_2(file_path: str) -> int:
     A report is safe if the levels are either all increasing or all decreasing
     and any two adjacent levels differ by at least one and at most three.
     """
+    levels, lengths = read_input_padded(file_path)
+    safe = are_safe_with_dampener(levels, lengths)
+    logger.debug(f"{len(safe) - safe.sum()} of {len(safe)} reports are not safe.")
+    return int(safe.sum())
+
+
+def part_2_loop(file_path: str) -> int:
     reports = read_input(file_path)
     safe_reports = 0
     for report in reports:
@@ -150,3 +281,9 @@ def part_2(file_path: str) -> int:
             safe_reports += 1
 
     return safe_reports
+
+
+IMPLEMENTATIONS = {
+    1: {"loop": part_1_loop, "numpy": part_1},
+    2: {"loop": part_2_loop, "numpy": part_2},
+}
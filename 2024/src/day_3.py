@@ -35,15 +35,169 @@ This time, the sum of the results is 48 (2*4 + 8*5).
 
 """
 
+import mmap
+import os
+import random
 import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 
 VALID_REGEX = r"mul\((\d{1,3}),(\d{1,3})\)"
 DO_REGEX = r"do\(\)"
 DONT_REGEX = r"don't\(\)"
 FULL_REGEX = r"mul\((\d{1,3}),(\d{1,3})\)|(do)\(\)|(don't)\(\)"
 
+TOKEN_REGEX = re.compile(FULL_REGEX.encode())
+# longest token: mul(999,999)
+MAX_TOKEN_LENGTH = 12
+CHUNK_SIZE = 2**24
+# Inputs larger than this are scanned by a pool of processes
+PARALLEL_THRESHOLD = 2**26
+
+# (sum if entering enabled, sum if entering disabled, state on exit or None
+# if the chunk has no do()/don't() and leaves the state unchanged)
+Summary = tuple[int, int, Optional[bool]]
+
+
+def summarise_chunk(
+    memory: mmap.mmap, start: int, end: int, conditionals: bool
+) -> Summary:
+    """
+    Summarise the tokens that start in memory[start:end].
+
+    No token can start inside another one, so a token belongs to the chunk it
+    starts in, and any offset is a safe chunk boundary. The scan reads up to
+    MAX_TOKEN_LENGTH - 1 bytes past the end to complete a token that spans it.
+    """
+    sum_if_enabled, sum_if_disabled = 0, 0
+    state: Optional[bool] = None
+
+    scan_end = min(end + MAX_TOKEN_LENGTH - 1, len(memory))
+    for match in TOKEN_REGEX.finditer(memory, start, scan_end):
+        if match.start() >= end:
+            break
+        if match[3]:
+            state = True if conditionals else None
+        elif match[4]:
+            state = False if conditionals else None
+        else:
+            product = int(match[1]) * int(match[2])
+            if state is None:
+                sum_if_enabled += product
+                sum_if_disabled += 0 if conditionals else product
+            elif state:
+                sum_if_enabled += product
+                sum_if_disabled += product
+
+    return sum_if_enabled, sum_if_disabled, state
+
+
+def combine_summaries(summaries: list[Summary]) -> int:
+    """
+    Fold the chunk summaries left to right, starting enabled.
+    """
+    total, enabled = 0, True
+    for sum_if_enabled, sum_if_disabled, state in summaries:
+        total += sum_if_enabled if enabled else sum_if_disabled
+        if state is not None:
+            enabled = state
+
+    return total
+
+
+def summarise_file_chunk(
+    file_path: str, start: int, end: int, conditionals: bool
+) -> Summary:
+    """
+    Map the file and summarise one of its chunks. Runs in a worker process.
+    """
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+            return summarise_chunk(memory, start, end, conditionals)
+
+
+def scan_file(file_path: str, conditionals: bool, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Stream the memory-mapped file chunk by chunk, in constant memory.
+    """
+    if os.path.getsize(file_path) == 0:
+        return 0
+
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+            return combine_summaries(
+                [
+                    summarise_chunk(memory, start, start + chunk_size, conditionals)
+                    for start in range(0, len(memory), chunk_size)
+                ]
+            )
+
+
+def scan_file_parallel(
+    file_path: str, conditionals: bool, n_workers: Optional[int] = None
+) -> int:
+    """
+    Summarise chunks of the file in a pool of processes, then combine the
+    summaries in order.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return 0
+
+    n_workers = n_workers or os.cpu_count() or 1
+    # a few chunks per worker to balance the load
+    chunk_size = max(-(-size // (4 * n_workers)), MAX_TOKEN_LENGTH)
+    starts = range(0, size, chunk_size)
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        summaries = list(
+            executor.map(
+                summarise_file_chunk,
+                [file_path] * len(starts),
+                starts,
+                [start + chunk_size for start in starts],
+                [conditionals] * len(starts),
+            )
+        )
+
+    return combine_summaries(summaries)
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate `size` fragments of corrupted memory.
+    """
+    rng = random.Random(seed)
+    fragments = [
+        "mul(2,4)",
+        "mul(123,4)",
+        "mul[3,7]",
+        "mul(32,64]",
+        "mul ( 2 , 4 )",
+        "do()",
+        "don't()",
+        "undo()?",
+        "xmul(11,8)",
+        "%&",
+        "mul(4*",
+    ]
+    return "".join(
+        rng.choice(fragments).replace("4", str(rng.randint(0, 999)))
+        for _ in range(size)
+    )
+
 
 def part_1(file_path: str) -> int:
+    if os.path.getsize(file_path) > PARALLEL_THRESHOLD:
+        return scan_file_parallel(file_path, conditionals=False)
+    return scan_file(file_path, conditionals=False)
+
+
+def part_1_parallel(file_path: str) -> int:
+    return scan_file_parallel(file_path, conditionals=False)
+
+
+def part_1_findall(file_path: str) -> int:
     with open(file_path, "r") as file:
         data = file.read()
         matches = re.findall(VALID_REGEX, data)
@@ -51,6 +205,16 @@ def part_1(file_path: str) -> int:
 
 
 def part_2(file_path: str) -> int:
+    if os.path.getsize(file_path) > PARALLEL_THRESHOLD:
+        return scan_file_parallel(file_path, conditionals=True)
+    return scan_file(file_path, conditionals=True)
+
+
+def part_2_parallel(file_path: str) -> int:
+    return scan_file_parallel(file_path, conditionals=True)
+
+
+def part_2_findall(file_path: str) -> int:
     with open(file_path, "r") as file:
         data = file.read()
     matches = re.findall(FULL_REGEX, data)
@@ -67,3 +231,9 @@ def part_2(file_path: str) -> int:
             total += int(match[0]) * int(match[1])
 
     return total
+
+
+IMPLEMENTATIONS = {
+    1: {"findall": part_1_findall, "mmap": part_1, "parallel": part_1_parallel},
+    2: {"findall": part_2_findall, "mmap": part_2, "parallel": part_2_parallel},
+}
@@ -65,6 +65,93 @@ In this example, an X-MAS appears 9 times.
 Flip the word search from the instructions back over to the word search side and try again. How many times does an X-MAS appear?
 """
 
+import random
+from collections import deque
+from typing import Iterator
+
+import numpy as np
+
+DIRECTIONS = [
+    (d_row, d_col)
+    for d_row in (-1, 0, 1)
+    for d_col in (-1, 0, 1)
+    if (d_row, d_col) != (0, 0)
+]
+
+
+# a stencil maps (row, col) offsets to the letter expected there
+Stencil = dict[tuple[int, int], str]
+
+# M . S
+# . A .
+# M . S
+X_MAS: Stencil = {(0, 0): "M", (0, 2): "S", (1, 1): "A", (2, 0): "M", (2, 2): "S"}
+
+
+class AhoCorasick:
+    """
+    Automaton matching a set of words in a single pass over a text.
+    """
+
+    words: list[str]
+    goto: list[dict[str, int]]
+    fail: list[int]
+    terminals: list[int]
+    order: list[int]
+
+    def __init__(self, words: list[str]):
+        self.words = words
+        self.goto = [{}]
+        self.fail = [0]
+        self.terminals = []
+
+        # trie of the words
+        for word in words:
+            node = 0
+            for letter in word:
+                if letter not in self.goto[node]:
+                    self.goto[node][letter] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                node = self.goto[node][letter]
+            self.terminals.append(node)
+
+        # failure links, in breadth-first order
+        self.order = []
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            self.order.append(node)
+            for letter, child in self.goto[node].items():
+                self.fail[child] = self.step(self.fail[node], letter)
+                queue.append(child)
+
+    def step(self, node: int, letter: str) -> int:
+        while node and letter not in self.goto[node]:
+            node = self.fail[node]
+        return self.goto[node].get(letter, 0)
+
+    def count(self, lines: Iterator[str]) -> dict[str, int]:
+        """
+        Count the occurrences of every word in the lines.
+
+        Only the state reached after each letter is counted while streaming.
+        A word ends at a position whenever its node is the reached state or one
+        of its failure ancestors, so the visits are summed up the failure tree
+        afterwards, in reverse breadth-first order.
+        """
+        visits = [0] * len(self.goto)
+        for line in lines:
+            node = 0
+            for letter in line:
+                node = self.step(node, letter)
+                visits[node] += 1
+
+        for node in reversed(self.order):
+            visits[self.fail[node]] += visits[node]
+
+        return {word: visits[node] for word, node in zip(self.words, self.terminals)}
+
 
 class LetterGrid:
     grid: list[list[str]]
@@ -101,6 +188,36 @@ class LetterGrid:
     def __str__(self) -> str:
         return "\n".join(["".join(row) for row in self.grid])
 
+    def lines(self) -> Iterator[str]:
+        """
+        Yield every row, column, diagonal and anti-diagonal, in both directions,
+        so that the lines cover the 8 reading directions.
+        """
+        diagonals: dict[int, list[str]] = {}
+        anti_diagonals: dict[int, list[str]] = {}
+        for row in range(self.n_rows):
+            for col in range(self.n_cols):
+                diagonals.setdefault(row - col, []).append(self.grid[row][col])
+                anti_diagonals.setdefault(row + col, []).append(self.grid[row][col])
+
+        families = [
+            ["".join(row) for row in self.grid],
+            ["".join(col) for col in zip(*self.grid)],
+            ["".join(diagonal) for diagonal in diagonals.values()],
+            ["".join(diagonal) for diagonal in anti_diagonals.values()],
+        ]
+        for family in families:
+            for line in family:
+                yield line
+                yield line[::-1]
+
+    def count_words(self, words: list[str]) -> dict[str, int]:
+        """
+        Count the occurrences of many words in the 8 directions at once, by
+        streaming every line once through an Aho-Corasick automaton.
+        """
+        return AhoCorasick(words).count(self.lines())
+
     def get_3_x_3(self, row: int, col: int) -> list[str]:
         if row + 2 >= self.n_rows or col + 2 >= self.n_cols:
             return []
@@ -119,7 +236,46 @@ class LetterGrid:
 
 def read_input(file_path: str) -> LetterGrid:
     with open(file_path, "r") as file:
-        return LetterGrid([line.strip().split() for line in file.readlines()])
+        return LetterGrid([list(line.strip()) for line in file if line.strip()])
+
+
+def read_array(file_path: str) -> np.ndarray:
+    """
+    Read the input file directly into a (rows, cols) uint8 array.
+    """
+    with open(file_path, "rb") as file:
+        rows = file.read().split()
+    return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1)
+
+
+def count_word(grid: np.ndarray, word: str) -> int:
+    """
+    Count the occurrences of a word in the 8 directions of a uint8 grid.
+
+    For each direction, the cells from which the word fits in the grid form a
+    rectangle. The k-th letter of the word is compared against that rectangle
+    shifted k steps in the direction, and the comparisons are combined with a
+    logical and, so no Python code runs per cell.
+    """
+    n_rows, n_cols = grid.shape
+    span = len(word) - 1
+    total = 0
+
+    for d_row, d_col in DIRECTIONS:
+        row_start, row_stop = max(0, -d_row * span), n_rows - max(0, d_row * span)
+        col_start, col_stop = max(0, -d_col * span), n_cols - max(0, d_col * span)
+        height, width = row_stop - row_start, col_stop - col_start
+        if height <= 0 or width <= 0:
+            continue
+
+        found = np.ones((height, width), dtype=bool)
+        for k, letter in enumerate(word.encode()):
+            row, col = row_start + d_row * k, col_start + d_col * k
+            found &= grid[row : row + height, col : col + width] == letter
+
+        total += int(found.sum())
+
+    return total
 
 
 def find_xmas(grid: LetterGrid) -> int:
@@ -215,11 +371,104 @@ def find_x_mas(grid: LetterGrid) -> int:
     return x_mas_count
 
 
+def normalise_stencil(stencil: Stencil) -> Stencil:
+    """
+    Shift the offsets of a stencil so that its smallest row and column are 0,
+    e.g. for a stencil centred on (0, 0).
+    """
+    min_row = min(row for row, _ in stencil)
+    min_col = min(col for _, col in stencil)
+    return {
+        (row - min_row, col - min_col): letter for (row, col), letter in stencil.items()
+    }
+
+
+def rotate_stencil(stencil: Stencil) -> Stencil:
+    """
+    Rotate a stencil a quarter turn clockwise, keeping its offsets non-negative.
+    """
+    return normalise_stencil(
+        {(col, -row): letter for (row, col), letter in stencil.items()}
+    )
+
+
+def rotations(stencil: Stencil) -> list[Stencil]:
+    """
+    Return the distinct quarter-turn rotations of a stencil.
+    """
+    unique: list[Stencil] = []
+    for _ in range(4):
+        if stencil not in unique:
+            unique.append(stencil)
+        stencil = rotate_stencil(stencil)
+    return unique
+
+
+def count_stencils(grid: np.ndarray, stencils: list[Stencil]) -> int:
+    """
+    Count the positions of a uint8 grid where each stencil matches.
+
+    Offsets may be negative, they are normalised first.
+    Each cell of a stencil compares the slice of the grid shifted by its
+    offset with its letter, and the boolean masks are combined with a logical
+    and over every anchor position at once. A position matching several
+    stencils counts once per stencil.
+    """
+    n_rows, n_cols = grid.shape
+    total = 0
+
+    for stencil in map(normalise_stencil, stencils):
+        height = n_rows - max(row for row, _ in stencil)
+        width = n_cols - max(col for _, col in stencil)
+        if height <= 0 or width <= 0:
+            continue
+
+        found = np.ones((height, width), dtype=bool)
+        for (row, col), letter in stencil.items():
+            found &= grid[row : row + height, col : col + width] == ord(letter)
+
+        total += int(found.sum())
+
+    return total
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate a `size` x `size` grid of the letters of XMAS.
+    """
+    rng = random.Random(seed)
+    return "".join(
+        "".join(rng.choice("XMAS") for _ in range(size)) + "\n" for _ in range(size)
+    )
+
+
 def part_1(file_path: str) -> int:
+    return count_word(read_array(file_path), "XMAS")
+
+
+def part_1_aho_corasick(file_path: str) -> int:
+    return read_input(file_path).count_words(["XMAS"])["XMAS"]
+
+
+def part_1_lists(file_path: str) -> int:
     grid = read_input(file_path)
     return find_xmas(grid)
 
 
 def part_2(file_path: str) -> int:
+    return count_stencils(read_array(file_path), rotations(X_MAS))
+
+
+def part_2_lists(file_path: str) -> int:
     grid = read_input(file_path)
     return find_x_mas(grid)
+
+
+IMPLEMENTATIONS = {
+    1: {
+        "lists": part_1_lists,
+        "numpy": part_1,
+        "aho_corasick": part_1_aho_corasick,
+    },
+    2: {"lists": part_2_lists, "numpy": part_2},
+}
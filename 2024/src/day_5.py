@@ -87,6 +87,9 @@ After taking only the incorrectly-ordered updates and ordering them correctly, t
 Find the updates which are not in the correct order. What do you get if you add up the middle page numbers after correctly ordering just those updates?
 """
 
+import random
+from collections import deque
+
 from loguru import logger
 
 
@@ -116,6 +119,77 @@ class Rule:
         return f"{self.first}|{self.second}"
 
 
+class RuleSet:
+    """
+    Rules indexed once for O(1) precedence lookups.
+    """
+
+    rules: list[Rule]
+    pairs: set[tuple[int, int]]
+    successors: dict[int, list[int]]
+    _sorted_pages: dict[frozenset[int], list[int]]
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self.pairs = {(rule.first, rule.second) for rule in rules}
+        self._sorted_pages = {}
+        self.successors = {}
+        for rule in rules:
+            self.successors.setdefault(rule.first, []).append(rule.second)
+
+    def precedes(self, first: int, second: int) -> bool:
+        """
+        Check if a rule requires `first` to be printed before `second`.
+        """
+        return (first, second) in self.pairs
+
+    def check_order(self, update: "Update") -> bool:
+        """
+        Check that a rule requires each page to be printed before the next one.
+
+        Assumes the rules totally order the pages of each update, as `sort` and
+        the middle-page answer already do, so a single pass over adjacent pairs
+        is enough: O(pages) constant-time lookups, whatever the number of rules.
+        """
+        pages = update.pages
+        return all(self.precedes(a, b) for a, b in zip(pages, pages[1:]))
+
+    def sort(self, pages: list[int]) -> list[int]:
+        """
+        Order pages so that every applicable rule is satisfied.
+
+        Topological sort (Kahn) of the subgraph of the rules induced by the
+        pages. The result only depends on the set of pages, so it is cached by
+        that signature and repeated page sets are nearly free.
+        """
+        signature = frozenset(pages)
+        if signature in self._sorted_pages:
+            return self._sorted_pages[signature]
+
+        n_predecessors = {page: 0 for page in pages}
+        for page in pages:
+            for successor in self.successors.get(page, []):
+                if successor in n_predecessors:
+                    n_predecessors[successor] += 1
+
+        ready = deque(page for page in pages if n_predecessors[page] == 0)
+        ordered = []
+        while ready:
+            page = ready.popleft()
+            ordered.append(page)
+            for successor in self.successors.get(page, []):
+                if successor in n_predecessors:
+                    n_predecessors[successor] -= 1
+                    if n_predecessors[successor] == 0:
+                        ready.append(successor)
+
+        if len(ordered) != len(n_predecessors):
+            raise ValueError("The rules contain a cycle.")
+
+        self._sorted_pages[signature] = ordered
+        return ordered
+
+
 class Update:
     pages: list[int]
 
@@ -135,6 +209,12 @@ class Update:
                 return False
         return True
 
+    def is_ordered(self, rule_set: RuleSet) -> bool:
+        return rule_set.check_order(self)
+
+    def sorted(self, rule_set: RuleSet) -> "Update":
+        return Update(list(rule_set.sort(self.pages)))
+
     def remove(self, value: int) -> int:
         """
         Remove the first instance of a value from the list.
@@ -190,16 +270,48 @@ def read_input(file_path: str) -> tuple[list[Rule], list[Update]]:
     return rules, updates
 
 
+def read_input_indexed(file_path: str) -> tuple[RuleSet, list[Update]]:
+    """
+    Reads the input file and returns the indexed rules and the updates.
+    """
+    rules, updates = read_input(file_path)
+    return RuleSet(rules), updates
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate the rules of a hidden total order of pages, followed by `size`
+    updates of shuffled pages.
+    """
+    rng = random.Random(seed)
+    order = rng.sample(range(10, 100), 40)
+    rules = [
+        f"{first}|{second}"
+        for i, first in enumerate(order)
+        for second in order[i + 1 :]
+    ]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(size):
+        pages = rng.sample(order, 2 * rng.randint(2, 11) + 1)
+        if rng.random() < 0.5:
+            pages.sort(key=order.index)
+        updates.append(",".join(map(str, pages)))
+
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+
 def part_1(file_path: str) -> int:
     """
     Determine which updates are already in the correct order.
     Returns the sum of the middle page number from those correctly-ordered updates.
     """
-    rules, updates = read_input(file_path)
+    rule_set, updates = read_input_indexed(file_path)
 
     correct_updates = []
     for update in updates:
-        correct = update.validate_order(rules)
+        correct = update.is_ordered(rule_set)
         if correct:
             correct_updates.append(update)
 
@@ -212,6 +324,18 @@ def part_1(file_path: str) -> int:
     return sum(middle_pages)
 
 
+def part_1_scan(file_path: str) -> int:
+    """
+    Same as `part_1`, checking every rule against every update.
+    """
+    rules, updates = read_input(file_path)
+    return sum(
+        update.pages[len(update.pages) // 2]
+        for update in updates
+        if update.validate_order(rules)
+    )
+
+
 def filter_rules(rules: list[Rule], update: Update) -> list[Rule]:
     """
     Filter the rules that apply to the update.
@@ -243,6 +367,24 @@ def part_2(file_path: str) -> int:
     Returns the sum of the middle page numbers after correctly ordering just those updates.
     """
 
+    rule_set, updates = read_input_indexed(file_path)
+
+    middle_pages = []
+    for update in updates:
+        if update.is_ordered(rule_set):
+            continue
+
+        re_ordered_update = update.sorted(rule_set)
+        middle_pages.append(re_ordered_update.pages[len(re_ordered_update.pages) // 2])
+
+    return sum(middle_pages)
+
+
+def part_2_filter(file_path: str) -> int:
+    """
+    Same as `part_2`, re-ordering by repeatedly filtering the rules.
+    """
+
     rules, updates = read_input(file_path)
 
     middle_pages = []
@@ -258,3 +400,9 @@ def part_2(file_path: str) -> int:
         middle_pages.append(re_ordered_update.pages[len(re_ordered_update.pages) // 2])
 
     return sum(middle_pages)
+
+
+IMPLEMENTATIONS = {
+    1: {"scan": part_1_scan, "indexed": part_1},
+    2: {"filter": part_2_filter, "indexed": part_2},
+}
@@ -177,6 +177,14 @@ It doesn't really matter what you choose to use as an obstacle so long as you an
 You need to get the guard stuck in a loop by adding a single new obstruction. How many different positions could you choose for this obstruction?
 """
 
+import bisect
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
 from loguru import logger
 
 
@@ -225,26 +233,90 @@ class Obstacle(Position):
         super().__init__(row, col)
 
 
+class ObstacleIndex:
+    """
+    Obstacles indexed by row and by column, as sorted lists of coordinates,
+    to find the nearest obstacle in a heading with a binary search.
+    """
+
+    cols_by_row: dict[int, list[int]]
+    rows_by_col: dict[int, list[int]]
+    cells: set[tuple[int, int]]
+
+    def __init__(self, obstacles: list[Obstacle]):
+        self.cols_by_row = {}
+        self.rows_by_col = {}
+        self.cells = set()
+        for obstacle in obstacles:
+            self.add(obstacle.row, obstacle.col)
+
+    def add(self, row: int, col: int) -> None:
+        bisect.insort(self.cols_by_row.setdefault(row, []), col)
+        bisect.insort(self.rows_by_col.setdefault(col, []), row)
+        self.cells.add((row, col))
+
+    def remove(self, row: int, col: int) -> None:
+        cols = self.cols_by_row[row]
+        del cols[bisect.bisect_left(cols, col)]
+        rows = self.rows_by_col[col]
+        del rows[bisect.bisect_left(rows, row)]
+        self.cells.remove((row, col))
+
+    def __contains__(self, position: Position) -> bool:
+        return (position.row, position.col) in self.cells
+
+    def next_blocker(self, row: int, col: int, direction: str) -> Optional[int]:
+        """
+        Return the row (moving up or down) or the column (moving left or right)
+        of the nearest obstacle ahead, or None if the way out is clear.
+        """
+        if direction in (Direction.UP, Direction.DOWN):
+            coordinates, current = self.rows_by_col.get(col, []), row
+        else:
+            coordinates, current = self.cols_by_row.get(row, []), col
+
+        if direction in (Direction.UP, Direction.LEFT):
+            i = bisect.bisect_left(coordinates, current)
+            return coordinates[i - 1] if i > 0 else None
+
+        i = bisect.bisect_right(coordinates, current)
+        return coordinates[i] if i < len(coordinates) else None
+
+
 class Guard:
     position: Position
     direction: Direction
-    turns: list[Position]
+    turns: set[tuple[int, int, str]]
+    looping: bool
 
     def __init__(self, position: Position, direction: str):
+        self.reset(position, direction)
+
+    def reset(self, position: Position, direction: str) -> None:
+        """
+        Put the guard back at a position, forgetting every turn.
+        """
         self.position = position
         self.direction = Direction.get_direction(direction)
-        self.turns = []
+        self.turns = set()
+        self.looping = False
 
     def rotate_right(self) -> None:
-        self.turns.append(self.position)
+        # turning twice at the same place in the same direction means the
+        # guard will repeat the same path forever
+        state = (self.position.row, self.position.col, self.direction)
+        if state in self.turns:
+            self.looping = True
+        self.turns.add(state)
+
         if self.direction == Direction.UP:
-            self.direction = Direction.get_direction("RIGHT")
+            self.direction = Direction.RIGHT
         elif self.direction == Direction.RIGHT:
-            self.direction = Direction.get_direction("DOWN")
+            self.direction = Direction.DOWN
         elif self.direction == Direction.DOWN:
-            self.direction = Direction.get_direction("LEFT")
+            self.direction = Direction.LEFT
         elif self.direction == Direction.LEFT:
-            self.direction = Direction.get_direction("UP")
+            self.direction = Direction.UP
 
     def get_immediate_next_position(self) -> Position:
         if self.direction == Direction.UP:
@@ -261,150 +333,27 @@ class Guard:
     def get_next_position(self, grid: "Grid") -> Position:
         # determine if an obstacle is located on the path
         # else return the position on the edge of the grid
+        row, col = self.position.row, self.position.col
+        blocker = grid.obstacle_index.next_blocker(row, col, self.direction)
 
+        # Mark the visited positions of the segment
         if self.direction == Direction.UP:
-            lower_bound = 0
-            blocked = False
-            for obstacle in grid.obstacles:
-                if (
-                    obstacle.row < self.position.row
-                    and obstacle.col == self.position.col
-                ):
-                    if obstacle.row >= lower_bound:
-                        lower_bound = obstacle.row
-                        blocked = True
-
-            if blocked:
-                # Add the visited positions
-                grid.visited_positions = grid.visited_positions.union(
-                    set(
-                        [
-                            Position(c, self.position.col)
-                            for c in range(lower_bound + 1, self.position.row)
-                        ]
-                    )
-                )
-
-                return Position(lower_bound + 1, self.position.col)
-            else:
-                # add the visited positions
-                grid.visited_positions = grid.visited_positions.union(
-                    set(
-                        [
-                            Position(c, self.position.col)
-                            for c in range(self.position.row)
-                        ]
-                    )
-                )
-
-                return Position(0, self.position.col)
-
+            stop = Position(0 if blocker is None else blocker + 1, col)
+            grid.visited[stop.row : row, col] = True
         elif self.direction == Direction.DOWN:
-            upper_bound = grid.n_rows
-            blocked = False
-            for obstacle in grid.obstacles:
-                if (
-                    obstacle.row > self.position.row
-                    and obstacle.col == self.position.col
-                ):
-                    if obstacle.row <= upper_bound:
-                        upper_bound = obstacle.row
-                        blocked = True
-            if blocked:
-                # Add the visited positions
-                grid.visited_positions = grid.visited_positions.union(
-                    set(
-                        [
-                            Position(c, self.position.col)
-                            for c in range(self.position.row + 1, upper_bound)
-                        ]
-                    )
-                )
-
-                return Position(upper_bound - 1, self.position.col)
-
-            # add the visited positions
-            grid.visited_positions = grid.visited_positions.union(
-                set(
-                    [
-                        Position(c, self.position.col)
-                        for c in range(self.position.row + 1, grid.n_rows)
-                    ]
-                )
-            )
-
-            return Position(grid.n_rows - 1, self.position.col)
-
+            stop = Position(grid.n_rows - 1 if blocker is None else blocker - 1, col)
+            grid.visited[row + 1 : stop.row + 1, col] = True
         elif self.direction == Direction.LEFT:
-            lower_bound = 0
-            blocked = False
-            for obstacle in grid.obstacles:
-                if (
-                    obstacle.row == self.position.row
-                    and obstacle.col < self.position.col
-                ):
-                    if obstacle.col >= lower_bound:
-                        lower_bound = obstacle.col
-                        blocked = True
-            if blocked:
-                # Add the visited positions
-                grid.visited_positions = grid.visited_positions.union(
-                    set(
-                        [
-                            Position(self.position.row, c)
-                            for c in range(lower_bound + 1, self.position.col)
-                        ]
-                    )
-                )
-
-                return Position(self.position.row, lower_bound + 1)
-
-            # add the visited positions
-            grid.visited_positions = grid.visited_positions.union(
-                set([Position(self.position.row, c) for c in range(self.position.col)])
-            )
-
-            return Position(self.position.row, 0)
-
+            stop = Position(row, 0 if blocker is None else blocker + 1)
+            grid.visited[row, stop.col : col] = True
         elif self.direction == Direction.RIGHT:
-            upper_bound = grid.n_cols
-            blocked = False
-            for obstacle in grid.obstacles:
-                if (
-                    obstacle.row == self.position.row
-                    and obstacle.col > self.position.col
-                ):
-                    if obstacle.col <= upper_bound:
-                        upper_bound = obstacle.col
-                        blocked = True
-            if blocked:
-                # Add the visited positions
-                grid.visited_positions = grid.visited_positions.union(
-                    set(
-                        [
-                            Position(self.position.row, c)
-                            for c in range(self.position.col + 1, upper_bound)
-                        ]
-                    )
-                )
-
-                return Position(self.position.row, upper_bound - 1)
-
-            # add the visited positions
-            grid.visited_positions = grid.visited_positions.union(
-                set(
-                    [
-                        Position(self.position.row, c)
-                        for c in range(self.position.col + 1, grid.n_cols)
-                    ]
-                )
-            )
-
-            return Position(self.position.row, grid.n_cols - 1)
-
+            stop = Position(row, grid.n_cols - 1 if blocker is None else blocker - 1)
+            grid.visited[row, col + 1 : stop.col + 1] = True
         else:
             raise ValueError("Invalid direction.")
 
+        return stop
+
     def is_out(self, grid: "Grid") -> bool:
         """
         Check if the guard is out of the grid.
@@ -417,42 +366,27 @@ class Guard:
             or next_position.col >= grid.n_cols
         )
 
-    def is_blocked(self, obstacles: list[Obstacle]) -> bool:
+    def is_blocked(self, obstacles: "ObstacleIndex") -> bool:
         """
         Check if the guard is blocked by an obstacle.
         We check if the next position is an obstacle.
         """
-        next_position = self.get_immediate_next_position()
+        return self.get_immediate_next_position() in obstacles
 
-        for obstacle in obstacles:
-            if next_position == obstacle:
-                return True
-
-        return False
-
-    def has_loop(self):
+    def has_loop(self) -> bool:
         """
-        Check that any sequence of 4 consecutive turns repeats itself.
+        Check if the guard has already turned at the same position, in the same
+        direction.
         """
-        if len(self.turns) < 5:
-            return False
-
-        for i in range(len(self.turns) - 4):
-            for j in range(i + 1, len(self.turns) - 3):
-                if (
-                    self.turns[i] == self.turns[j]
-                    and self.turns[i + 1] == self.turns[j + 1]
-                    and self.turns[i + 2] == self.turns[j + 2]
-                    and self.turns[i + 3] == self.turns[j + 3]
-                ):
-                    return True
+        return self.looping
 
 
 class Grid:
     grid: list[list[str]]
     guard: Guard
     obstacles: list[Obstacle]
-    visited_positions: set[Position]
+    obstacle_index: ObstacleIndex
+    visited: np.ndarray
     turns: list[Position]
 
     def __init__(
@@ -460,14 +394,17 @@ class Grid:
         grid: list[list[str]],
         guard: Guard,
         obstacles: list[Obstacle],
-        visited_positions: set[Position],
-        turns: list[Position] = [],
+        turns: Optional[list[Position]] = None,
     ):
         self.grid = grid
         self.guard = guard
         self.obstacles = obstacles
-        self.visited_positions = visited_positions
-        self.turns = turns
+        self.obstacle_index = ObstacleIndex(obstacles)
+        self.turns = turns if turns is not None else []
+
+        # one flag per cell, filled a whole segment at a time
+        self.visited = np.zeros((self.n_rows, self.n_cols), dtype=bool)
+        self.visited[guard.position.row, guard.position.col] = True
 
     @property
     def n_rows(self) -> int:
@@ -477,9 +414,22 @@ class Grid:
     def n_cols(self) -> int:
         return len(self.grid[0])
 
+    @property
+    def visited_positions(self) -> set[Position]:
+        return {Position(int(row), int(col)) for row, col in np.argwhere(self.visited)}
+
     @property
     def n_visited_positions(self) -> int:
-        return len(self.visited_positions)
+        return int(np.count_nonzero(self.visited))
+
+    def add_obstacle(self, obstacle: Obstacle) -> None:
+        self.obstacles.append(obstacle)
+        self.obstacle_index.add(obstacle.row, obstacle.col)
+
+    def remove_last_obstacle(self) -> Obstacle:
+        obstacle = self.obstacles.pop()
+        self.obstacle_index.remove(obstacle.row, obstacle.col)
+        return obstacle
 
     @classmethod
     def from_str(cls, str_grid: list[list[str]]):
@@ -501,14 +451,14 @@ class Grid:
         assert guard is not None, "Guard not found."
         assert len(obstacles) > 0, "No obstacles found."
 
-        return cls(str_grid, guard, obstacles, visited_positions={guard.position})
+        return cls(str_grid, guard, obstacles)
 
     def plot_map(self, with_added_obstacle: bool = False):
         updated_grid = [["." for _ in range(self.n_cols)] for _ in range(self.n_rows)]
 
         # Add visited positions
-        for position in self.visited_positions:
-            updated_grid[position.row][position.col] = "X"
+        for row, col in np.argwhere(self.visited):
+            updated_grid[row][col] = "X"
 
         # Add guard position
         updated_grid[self.guard.position.row][self.guard.position.col] = str(
@@ -531,12 +481,12 @@ class Grid:
 
         # Add the guard's starting position
         self.guard.position = Position(row, col)
-        self.visited_positions.add(self.guard.position)
+        self.visited[row, col] = True
 
         # Move the guard until it is out of the grid or stuck in a loop
         while not self.guard.is_out(self) and not self.guard.has_loop():
             # Check if the guard is blocked by an obstacle
-            if self.guard.is_blocked(self.obstacles):
+            if self.guard.is_blocked(self.obstacle_index):
                 self.turns.append(self.guard.position)
                 self.guard.rotate_right()
 
@@ -547,11 +497,245 @@ class Grid:
                 self.plot_map(with_added_obstacle=with_added_obstacle)
 
         if self.guard.has_loop():
-            print("Guard is stuck in a loop.")
+            logger.debug("Guard is stuck in a loop.")
         elif self.guard.is_out(self):
-            print("Guard is out of the grid.")
+            logger.debug("Guard is out of the grid.")
+
+        logger.debug(f"Visited positions: {self.n_visited_positions}")
+
 
-        print(self.n_visited_positions)
+# clockwise, so that turning right is (heading + 1) % 4
+HEADINGS = [Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT]
+UP, RIGHT, DOWN, LEFT = range(4)
+
+# a checkpoint is (candidate cell, cell of the guard, heading of the guard) just
+# before the guard first enters the candidate cell on the unobstructed path
+Checkpoint = tuple[int, int, int]
+
+# number of candidate obstacles above which part 2 is sharded across processes
+PARALLEL_THRESHOLD = 50_000
+
+
+class JumpTable:
+    """
+    Precomputed cell where the guard stops for every (heading, cell) of the
+    base map: the cell before the nearest obstacle ahead, or the edge of the
+    map when the way is clear. Cells are flat indices row * n_cols + col.
+
+    A single extra obstacle (the part 2 candidate) is handled by correcting the
+    looked-up stop when the candidate lies on its row or column, between the
+    guard and the stop, so the table never has to be rebuilt.
+    """
+
+    n_rows: int
+    n_cols: int
+    stops: np.ndarray
+
+    def __init__(self, obstacles: np.ndarray):
+        self.n_rows, self.n_cols = obstacles.shape
+        rows = np.broadcast_to(np.arange(self.n_rows)[:, None], obstacles.shape)
+        cols = np.broadcast_to(np.arange(self.n_cols)[None, :], obstacles.shape)
+
+        # nearest obstacle at or before each cell along each axis
+        above = np.maximum.accumulate(np.where(obstacles, rows, -1), axis=0)
+        below = np.minimum.accumulate(
+            np.where(obstacles, rows, self.n_rows)[::-1], axis=0
+        )[::-1]
+        left = np.maximum.accumulate(np.where(obstacles, cols, -1), axis=1)
+        right = np.minimum.accumulate(
+            np.where(obstacles, cols, self.n_cols)[:, ::-1], axis=1
+        )[:, ::-1]
+
+        # shift by one cell, so that the obstacle is strictly ahead
+        stop_up = np.vstack([np.full((1, self.n_cols), -1), above[:-1]]) + 1
+        stop_down = np.vstack([below[1:], np.full((1, self.n_cols), self.n_rows)]) - 1
+        stop_left = np.hstack([np.full((self.n_rows, 1), -1), left[:, :-1]]) + 1
+        stop_right = (
+            np.hstack([right[:, 1:], np.full((self.n_rows, 1), self.n_cols)]) - 1
+        )
+
+        self.stops = np.stack(
+            [
+                (stop_up * self.n_cols + cols).ravel(),
+                (rows * self.n_cols + stop_right).ravel(),
+                (stop_down * self.n_cols + cols).ravel(),
+                (rows * self.n_cols + stop_left).ravel(),
+            ]
+        ).astype(np.int32)
+
+    @classmethod
+    def from_stops(cls, stops: np.ndarray, n_rows: int, n_cols: int) -> "JumpTable":
+        table = cls.__new__(cls)
+        table.n_rows, table.n_cols, table.stops = n_rows, n_cols, stops
+        return table
+
+    @classmethod
+    def from_grid(cls, grid: "Grid") -> "JumpTable":
+        obstacles = np.zeros((grid.n_rows, grid.n_cols), dtype=bool)
+        for obstacle in grid.obstacles:
+            obstacles[obstacle.row, obstacle.col] = True
+        return cls(obstacles)
+
+    def stop(self, cell: int, heading: int, extra: int = -1) -> int:
+        """
+        Return the cell where the guard starting at `cell` stops, taking the
+        extra obstacle into account.
+        """
+        stop = int(self.stops[heading, cell])
+        if extra < 0:
+            return stop
+
+        row, col = divmod(cell, self.n_cols)
+        extra_row, extra_col = divmod(extra, self.n_cols)
+        stop_row, stop_col = divmod(stop, self.n_cols)
+
+        if heading == UP and extra_col == col and stop_row <= extra_row < row:
+            return stop + (extra_row + 1 - stop_row) * self.n_cols
+        if heading == DOWN and extra_col == col and row < extra_row <= stop_row:
+            return stop - (stop_row - extra_row + 1) * self.n_cols
+        if heading == LEFT and extra_row == row and stop_col <= extra_col < col:
+            return extra + 1
+        if heading == RIGHT and extra_row == row and col < extra_col <= stop_col:
+            return extra - 1
+        return stop
+
+    def exits(self, cell: int, heading: int) -> bool:
+        """
+        Check if the next step from `cell` leaves the map.
+        """
+        row, col = divmod(cell, self.n_cols)
+        return (
+            (heading == UP and row == 0)
+            or (heading == DOWN and row == self.n_rows - 1)
+            or (heading == LEFT and col == 0)
+            or (heading == RIGHT and col == self.n_cols - 1)
+        )
+
+    def checkpoints(self, cell: int, heading: int) -> list[Checkpoint]:
+        """
+        Walk the unobstructed path and record the state of the guard just before
+        it first enters each cell, except the start.
+        Until then, an obstacle in that cell does not change the path, so its
+        simulation can resume from the checkpoint.
+        """
+        steps = [-self.n_cols, 1, self.n_cols, -1]
+        # the start is never a candidate, even when the guard comes back to it
+        entries: dict[int, tuple[int, int]] = {cell: (cell, heading)}
+        start = cell
+        turns: set[int] = set()
+        while True:
+            stop = self.stop(cell, heading)
+            while cell != stop:
+                entries.setdefault(cell + steps[heading], (cell, heading))
+                cell += steps[heading]
+            if self.exits(cell, heading):
+                break
+
+            state = cell * 4 + heading
+            if state in turns:
+                break
+            turns.add(state)
+            heading = (heading + 1) % 4
+
+        return [
+            (candidate, previous, previous_heading)
+            for candidate, (previous, previous_heading) in entries.items()
+            if candidate != start
+        ]
+
+    def has_loop(self, cell: int, heading: int, extra: int = -1) -> bool:
+        """
+        Simulate the guard one segment at a time. The guard loops as soon as it
+        turns twice at the same cell with the same heading.
+        """
+        turns: set[int] = set()
+        while True:
+            cell = self.stop(cell, heading, extra)
+            if self.exits(cell, heading):
+                return False
+
+            state = cell * 4 + heading
+            if state in turns:
+                return True
+            turns.add(state)
+            heading = (heading + 1) % 4
+
+
+# jump table of a worker process, attached to the shared memory of the parent
+_worker_table: Optional[JumpTable] = None
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+
+
+def _attach_jump_table(name: str, n_rows: int, n_cols: int) -> None:
+    global _worker_table, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    stops = np.ndarray((4, n_rows * n_cols), dtype=np.int32, buffer=_worker_memory.buf)
+    stops.flags.writeable = False
+    _worker_table = JumpTable.from_stops(stops, n_rows, n_cols)
+
+
+def _count_loops(checkpoints: list[Checkpoint]) -> int:
+    return sum(
+        _worker_table.has_loop(cell, heading, extra=candidate)
+        for candidate, cell, heading in checkpoints
+    )
+
+
+def count_loops_parallel(
+    jump_table: JumpTable,
+    checkpoints: list[Checkpoint],
+    n_workers: Optional[int] = None,
+) -> int:
+    """
+    Count the looping candidates in a pool of processes. The jump table is
+    copied once into shared memory, and each worker maps it read-only.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    # a few shards per worker to balance the load
+    shard_size = max(-(-len(checkpoints) // (4 * n_workers)), 1)
+    shards = [
+        checkpoints[i : i + shard_size] for i in range(0, len(checkpoints), shard_size)
+    ]
+
+    memory = shared_memory.SharedMemory(create=True, size=jump_table.stops.nbytes)
+    try:
+        stops = np.ndarray(jump_table.stops.shape, dtype=np.int32, buffer=memory.buf)
+        stops[:] = jump_table.stops
+
+        looping, checked = 0, 0
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_attach_jump_table,
+            initargs=(memory.name, jump_table.n_rows, jump_table.n_cols),
+        ) as executor:
+            futures = {
+                executor.submit(_count_loops, shard): len(shard) for shard in shards
+            }
+            for future in as_completed(futures):
+                looping += future.result()
+                checked += futures[future]
+                logger.info(f"Checked {checked}/{len(checkpoints)} candidates.")
+
+        del stops
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return looping
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate a `size` x `size` map with a few obstacles and the guard heading up.
+    """
+    rng = random.Random(seed)
+    size = max(size, 2)
+    rows = [
+        ["#" if rng.random() < 0.05 else "." for _ in range(size)] for _ in range(size)
+    ]
+    rows[0][0] = "#"
+    rows[rng.randrange(1, size)][rng.randrange(size)] = "^"
+    return "".join("".join(row) + "\n" for row in rows)
 
 
 def read_map(file_path: str) -> list[list[str]]:
@@ -559,23 +743,76 @@ def read_map(file_path: str) -> list[list[str]]:
         return [[c for c in line.strip()] for line in file]
 
 
-def part_1(file_path: str):
+def part_1(file_path: str) -> int:
     """
     We need to predict the path of the guard and determine how many distinct positions
     the guard will visit before leaving the mapped area.
     """
 
     grid = Grid.from_str(read_map(file_path))
-    grid.plot_map()
-    grid.move_guard(verbose=True)
+    grid.move_guard(verbose=False)
+
+    return grid.n_visited_positions
+
+
+def find_checkpoints(file_path: str) -> tuple[JumpTable, list[Checkpoint]]:
+    """
+    Load the grid, build its jump table and walk the unobstructed path to find
+    all the possible positions where we can place an obstacle.
+    """
+
+    grid = Grid.from_str(read_map(file_path))
+    start = grid.guard.position
+    jump_table = JumpTable.from_grid(grid)
+    checkpoints = jump_table.checkpoints(
+        start.row * grid.n_cols + start.col, HEADINGS.index(grid.guard.direction)
+    )
+    logger.info(f"Possible positions: {len(checkpoints)}")
 
+    return jump_table, checkpoints
 
-def part_2(file_path: str):
+
+def part_2(file_path: str) -> int:
     """
     We need to find all the possible positions where we can place an obstacle
     such that the guard gets stuck in a loop.
     """
 
+    jump_table, checkpoints = find_checkpoints(file_path)
+
+    # Then simulate the guard with each obstacle using the jump table, from
+    # just before it reaches the obstacle
+    if len(checkpoints) > PARALLEL_THRESHOLD:
+        looping_obstacles = count_loops_parallel(jump_table, checkpoints)
+    else:
+        looping_obstacles = sum(
+            jump_table.has_loop(cell, heading, extra=candidate)
+            for candidate, cell, heading in checkpoints
+        )
+
+    logger.debug(f"Found {looping_obstacles} looping obstacles.")
+
+    return looping_obstacles
+
+
+def part_2_parallel(file_path: str) -> int:
+    """
+    Same as `part_2`, with the candidates sharded across processes.
+    """
+
+    jump_table, checkpoints = find_checkpoints(file_path)
+    looping_obstacles = count_loops_parallel(jump_table, checkpoints)
+
+    logger.debug(f"Found {looping_obstacles} looping obstacles.")
+
+    return looping_obstacles
+
+
+def part_2_simulation(file_path: str) -> int:
+    """
+    Same as `part_2`, simulating the guard move by move for each obstacle.
+    """
+
     # Load the grid
     grid = Grid.from_str(read_map(file_path))
 
@@ -590,10 +827,8 @@ def part_2(file_path: str):
     ]
 
     # Reset the grid
-    grid.visited_positions.clear()
-    grid.guard.position = guard_start
-    grid.guard.direction = guard_start_direction
-    grid.guard.turns.clear()
+    grid.visited[:] = False
+    grid.guard.reset(guard_start, guard_start_direction)
 
     # Count the number of looping obstacles
     looping_obstacles = 0
@@ -605,7 +840,7 @@ def part_2(file_path: str):
             f"Guard start: {guard_start}, direction: {guard_start_direction}, obstacle: {position}"
         )
         logger.info(f"Adding obstacle at position {position}.")
-        grid.obstacles.append(Obstacle(position.row, position.col))
+        grid.add_obstacle(Obstacle(position.row, position.col))
 
         grid.move_guard(verbose=False, with_added_obstacle=False)
 
@@ -613,13 +848,22 @@ def part_2(file_path: str):
             looping_obstacles += 1
 
         # remove the last obstacle from the grid
-        grid.obstacles.pop()
-        grid.visited_positions.clear()
+        grid.remove_last_obstacle()
+        grid.visited[:] = False
 
-        grid.guard.position = guard_start
-        grid.guard.direction = guard_start_direction
-        grid.guard.turns.clear()
+        grid.guard.reset(guard_start, guard_start_direction)
 
         logger.info(f"Done with position {i+1}/{len(possible_positions)}.")
 
-    print(f"Found {looping_obstacles} looping obstacles.")
+    logger.debug(f"Found {looping_obstacles} looping obstacles.")
+
+    return looping_obstacles
+
+
+IMPLEMENTATIONS = {
+    2: {
+        "simulation": part_2_simulation,
+        "jump_table": part_2,
+        "parallel": part_2_parallel,
+    },
+}
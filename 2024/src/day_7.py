@@ -46,9 +46,220 @@ Using your new knowledge of elephant hiding spots, determine which equations cou
 """
 
 import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from loguru import logger
+
+# number of equations above which they are evaluated across processes
+PARALLEL_THRESHOLD = 100_000
+CHUNK_SIZE = 1_000
+
+Equation = tuple[int, list[int]]
+# (test value, solvable, duration in seconds) of an equation
+Evaluation = tuple[int, bool, float]
+
+
+class Operator:
+    """
+    A binary operator, with its inverse on the right operand: `undo(result, b)`
+    returns `a` such that `apply(a, b) == result`, or None if there is none.
+    """
+
+    symbol: str
+    apply: Callable[[int, int], int]
+    undo: Callable[[int, int], Optional[int]]
+
+    def __init__(
+        self,
+        symbol: str,
+        apply: Callable[[int, int], int],
+        undo: Callable[[int, int], Optional[int]],
+    ):
+        self.symbol = symbol
+        self.apply = apply
+        self.undo = undo
+
+    def __repr__(self) -> str:
+        return f"Operator({self.symbol})"
+
+
+def digits_power(number: int) -> int:
+    """
+    Smallest power of ten greater than the number, e.g. 100 for 42.
+    """
+    power = 10
+    while power <= number:
+        power *= 10
+    return power
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def subtract(result: int, b: int) -> Optional[int]:
+    return result - b if result >= b else None
+
+
+def multiply(a: int, b: int) -> int:
+    return a * b
+
+
+def divide(result: int, b: int) -> Optional[int]:
+    return result // b if b and result % b == 0 else None
+
+
+def concatenate(a: int, b: int) -> int:
+    return a * digits_power(b) + b
+
+
+def strip(result: int, b: int) -> Optional[int]:
+    if result <= b:
+        return None
+    power = digits_power(b)
+    return (result - b) // power if (result - b) % power == 0 else None
+
+
+ADD = Operator("+", add, subtract)
+MULTIPLY = Operator("*", multiply, divide)
+CONCATENATE = Operator("||", concatenate, strip)
+
+PART_1_OPERATORS = [ADD, MULTIPLY]
+PART_2_OPERATORS = [ADD, MULTIPLY, CONCATENATE]
+
+
+def read_equations(file_path: str) -> list[Equation]:
+    equations = []
+    with open(file_path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            test_value, numbers = line.split(":")
+            equations.append((int(test_value), list(map(int, numbers.split()))))
+    return equations
+
+
+def is_solvable(test_value: int, numbers: list[int], operators: list[Operator]) -> bool:
+    """
+    Solve the equation from right to left, undoing the last operator with each
+    of the operators. A branch is dropped as soon as no operator can be undone,
+    so most of the len(operators)**n assignments are never explored.
+    Operands are assumed to be positive, as in the puzzle input.
+    """
+
+    stack = [(test_value, len(numbers) - 1)]
+    while stack:
+        target, i = stack.pop()
+        number = numbers[i]
+        if i == 0:
+            if target == number:
+                return True
+            continue
+
+        for operator in operators:
+            previous = operator.undo(target, number)
+            if previous is not None:
+                stack.append((previous, i - 1))
+
+    return False
+
+
+def evaluate_chunk(
+    equations: list[Equation], operators: list[Operator]
+) -> list[Evaluation]:
+    evaluations = []
+    for test_value, numbers in equations:
+        start = time.perf_counter()
+        solvable = is_solvable(test_value, numbers, operators)
+        evaluations.append((test_value, solvable, time.perf_counter() - start))
+    return evaluations
+
+
+def evaluate(
+    equations: list[Equation],
+    operators: list[Operator],
+    n_workers: Optional[int] = None,
+) -> list[Evaluation]:
+    """
+    Evaluate the equations in order, in chunks across a pool of processes when
+    there are more than PARALLEL_THRESHOLD of them or `n_workers` is given.
+    """
+
+    if n_workers is None and len(equations) <= PARALLEL_THRESHOLD:
+        return evaluate_chunk(equations, operators)
+
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = [
+        equations[i : i + CHUNK_SIZE] for i in range(0, len(equations), CHUNK_SIZE)
+    ]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(evaluate_chunk, chunks, [operators] * len(chunks))
+        return [evaluation for chunk in results for evaluation in chunk]
+
+
+def log_slowest(evaluations: list[Evaluation], n: int = 5) -> None:
+    """
+    Log the slowest equations, with their line number.
+    """
+    slowest = sorted(
+        enumerate(evaluations, start=1), key=lambda item: item[1][2], reverse=True
+    )
+    for line, (test_value, solvable, duration) in slowest[:n]:
+        logger.debug(
+            f"Line {line}: {test_value} solvable={solvable} in {duration * 1000:.3f}ms"
+        )
+
+
+def calibrate(
+    file_path: str, operators: list[Operator], n_workers: Optional[int] = None
+) -> int:
+    """
+    Sum the test values of the equations that can be solved with the operators.
+    """
+    evaluations = evaluate(read_equations(file_path), operators, n_workers)
+    log_slowest(evaluations)
+    return sum(test_value for test_value, solvable, _ in evaluations if solvable)
+
+
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate `size` equations, half of them solvable with the three operators.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        numbers = [rng.randint(1, 99) for _ in range(rng.randint(2, 7))]
+        if rng.random() < 0.5:
+            test_value = numbers[0]
+            for number in numbers[1:]:
+                test_value = rng.choice(PART_2_OPERATORS).apply(test_value, number)
+        else:
+            test_value = rng.randint(1, 10 ** rng.randint(2, 10))
+        lines.append(f"{test_value}: {' '.join(map(str, numbers))}")
+    return "\n".join(lines) + "\n"
 
 
 def part_1(file_path: str) -> int:
+    return calibrate(file_path, PART_1_OPERATORS)
+
+
+def part_1_parallel(file_path: str) -> int:
+    return calibrate(file_path, PART_1_OPERATORS, n_workers=os.cpu_count() or 1)
+
+
+def part_2(file_path: str) -> int:
+    return calibrate(file_path, PART_2_OPERATORS)
+
+
+def part_2_parallel(file_path: str) -> int:
+    return calibrate(file_path, PART_2_OPERATORS, n_workers=os.cpu_count() or 1)
+
+
+def part_1_enumerate(file_path: str) -> int:
     with open(file_path, "r") as file:
         lines = file.readlines()
 
@@ -83,7 +294,7 @@ def part_1(file_path: str) -> int:
     return total
 
 
-def part_2(file_path: str) -> int:
+def part_2_enumerate(file_path: str) -> int:
     with open(file_path, "r") as file:
         lines = file.readlines()
 
@@ -117,3 +328,17 @@ def part_2(file_path: str) -> int:
                 break
 
     return total
+
+
+IMPLEMENTATIONS = {
+    1: {
+        "enumerate": part_1_enumerate,
+        "backward": part_1,
+        "parallel": part_1_parallel,
+    },
+    2: {
+        "enumerate": part_2_enumerate,
+        "backward": part_2,
+        "parallel": part_2_parallel,
+    },
+}
@@ -115,6 +115,8 @@ Calculate the impact of the signal using this updated model. How many unique loc
 # Path: src/day_8.py
 # --- Part One ---
 
+from typing import Iterator
+
 
 class Position:
     x: int
@@ -152,11 +154,24 @@ class Antenna:
 
 class Grid:
     antennas: list[Antenna]
+    antennas_by_frequency: dict[str, list[Antenna]]
     grid: list[list[str]]
 
     def __init__(self, antennas: list[Antenna], grid: list[list[str]]):
         self.antennas = antennas
         self.grid = grid
+        self.antennas_by_frequency = {}
+        for antenna in antennas:
+            self.antennas_by_frequency.setdefault(antenna.frequency, []).append(antenna)
+
+    def frequency_pairs(self) -> Iterator[tuple[Antenna, Antenna]]:
+        """
+        Iterate over the pairs of antennas sharing a frequency, bucket by bucket.
+        """
+        for antennas in self.antennas_by_frequency.values():
+            for i in range(len(antennas)):
+                for j in range(i + 1, len(antennas)):
+                    yield antennas[i], antennas[j]
 
     def __plot(self, antinodes: set[Position]):
         plot_grid = [list(row) for row in self.grid]
@@ -173,11 +188,8 @@ class Grid:
     def get_antinodes(self) -> set[Position]:
         antinodes = set()
 
-        for i in range(len(self.antennas)):
-            for j in range(i + 1, len(self.antennas)):
-                antinodes.update(
-                    self.get_antinodes_between(self.antennas[i], self.antennas[j])
-                )
+        for antenna_1, antenna_2 in self.frequency_pairs():
+            antinodes.update(self.get_antinodes_between(antenna_1, antenna_2))
 
         self.__plot(antinodes)
         return antinodes
@@ -185,13 +197,10 @@ class Grid:
     def get_antinodes_with_resonant_harmonics(self) -> set[Position]:
         antinodes = set()
 
-        for i in range(len(self.antennas)):
-            for j in range(i + 1, len(self.antennas)):
-                antinodes.update(
-                    self.get_antinodes_between_with_resonant_harmonics(
-                        self.antennas[i], self.antennas[j]
-                    )
-                )
+        for antenna_1, antenna_2 in self.frequency_pairs():
+            antinodes.update(
+                self.get_antinodes_between_with_resonant_harmonics(antenna_1, antenna_2)
+            )
 
         self.__plot(antinodes)
         return antinodes
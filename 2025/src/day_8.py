@@ -67,6 +67,7 @@ from loguru import logger
 from typing import Literal
 from typing import Optional
 import math
+import random
 import networkx as nx
 import numpy as np
 from scipy.spatial.distance import cdist
@@ -135,6 +136,47 @@ class Connection:
         )
 
 
+class DisjointSet:
+    """
+    Union-find over junction box ids, with union by size and path halving.
+    """
+
+    parents: list[int]
+    sizes: list[int]
+    n_sets: int
+
+    def __init__(self, n: int):
+        self.parents = list(range(n))
+        self.sizes = [1] * n
+        self.n_sets = n
+
+    def find(self, i: int) -> int:
+        while self.parents[i] != i:
+            self.parents[i] = self.parents[self.parents[i]]
+            i = self.parents[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        """
+        Merge the sets of i and j. Return False if they were already merged.
+        """
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return False
+        if self.sizes[root_i] < self.sizes[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parents[root_j] = root_i
+        self.sizes[root_i] += self.sizes[root_j]
+        self.n_sets -= 1
+        return True
+
+    def sets(self) -> list[set[int]]:
+        groups: dict[int, set[int]] = {}
+        for i in range(len(self.parents)):
+            groups.setdefault(self.find(i), set()).add(i)
+        return list(groups.values())
+
+
 class Grid:
     connections: list[Connection]
     junction_boxes: list[JunctionBox]
@@ -208,10 +250,69 @@ class Grid:
             return connected_components[:top_n]
         return connected_components
 
+    def find_connected_circuits_union_find(
+        self, top_n: Optional[int] = None
+    ) -> list[set[int]]:
+        """
+        Same as `find_connected_circuits`, using a union-find instead of networkx.
+        """
+        disjoint_set = DisjointSet(len(self.junction_boxes))
+        for connection in self.connections:
+            disjoint_set.union(
+                connection.junction_box_1.id, connection.junction_box_2.id
+            )
+
+        connected_components = disjoint_set.sets()
+        connected_components.sort(key=len, reverse=True)
+        if top_n is not None:
+            return connected_components[:top_n]
+        return connected_components
+
+    def sorted_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the (i, j) indices of every pair of junction boxes, i < j,
+        sorted by increasing distance. Ties keep the row-major order used by
+        `find_shortest_cable`.
+        """
+        coordinates = np.array(
+            [
+                [junction_box.x, junction_box.y, junction_box.z]
+                for junction_box in self.junction_boxes
+            ],
+            dtype=np.int64,
+        )
+        i, j = np.triu_indices(len(self.junction_boxes), k=1)
+        squared_distances = ((coordinates[i] - coordinates[j]) ** 2).sum(axis=1)
+        order = np.argsort(squared_distances, kind="stable")
+        return i[order], j[order]
+
     def is_fully_connected(self) -> bool:
         return len(self.find_connected_circuits()) == 1
 
 
+def generate_input(size: int, seed: int) -> str:
+    """
+    Generate 80 junction boxes in clusters of various densities, then `size`
+    boxes spread uniformly. The clusters keep the 1000 connections of part 1
+    from joining every box into a single circuit on small inputs.
+    """
+    rng = random.Random(seed)
+
+    lines: list[str] = []
+    while len(lines) < 80:
+        center = [rng.randint(10**4, 10**5) for _ in range(3)]
+        spread = int(10 ** rng.uniform(1, 4))
+        for _ in range(min(rng.randint(5, 30), 80 - len(lines))):
+            x, y, z = (c + rng.randint(-spread, spread) for c in center)
+            lines.append(f"{x},{y},{z}\n")
+
+    for _ in range(size):
+        x, y, z = (rng.randint(0, 11 * 10**4) for _ in range(3))
+        lines.append(f"{x},{y},{z}\n")
+
+    return "".join(lines)
+
+
 def part_1(file_path: str) -> int:
     """
     Read the input file and return the solution.
@@ -253,3 +354,39 @@ def part_2(file_path: str) -> int:
         grid.connections.append(last_connection)
 
     return last_connection.junction_box_1.x * last_connection.junction_box_2.x
+
+
+def part_1_union_find(file_path: str) -> int:
+    grid: Grid = Grid.from_file(file_path)
+    n_cables: Literal[10, 1000] = 10 if "test" in file_path else 1000
+
+    pairs_i, pairs_j = grid.sorted_pairs()
+    for i, j in zip(pairs_i[:n_cables], pairs_j[:n_cables]):
+        grid.connections.append(
+            Connection(grid.junction_boxes[i], grid.junction_boxes[j])
+        )
+
+    circuits = grid.find_connected_circuits_union_find(top_n=3)
+    return math.prod(len(circuit) for circuit in circuits)
+
+
+def part_2_union_find(file_path: str) -> int:
+    """
+    Kruskal: add the cables by increasing length until a single circuit remains.
+    """
+    grid: Grid = Grid.from_file(file_path)
+    disjoint_set = DisjointSet(len(grid.junction_boxes))
+
+    pairs_i, pairs_j = grid.sorted_pairs()
+    for i, j in zip(pairs_i.tolist(), pairs_j.tolist()):
+        disjoint_set.union(i, j)
+        if disjoint_set.n_sets == 1:
+            return grid.junction_boxes[i].x * grid.junction_boxes[j].x
+
+    raise ValueError("The junction boxes cannot be fully connected.")
+
+
+IMPLEMENTATIONS = {
+    1: {"reference": part_1, "union_find": part_1_union_find},
+    2: {"reference": part_2, "union_find": part_2_union_find},
+}
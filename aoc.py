@@ -6,21 +6,32 @@ import argparse
 import importlib
 import os
 import sys
+from types import ModuleType
 from typing import Callable
 
 from loguru import logger
 
+from instrumentation import GC_MODES, gc_mode, measure
 
-def run_day(year_index: int, day_index: int, part: int) -> Callable:
-    """'
-    Programmatically run the challenge for the given year, day and part.
+
+def load_module(year_index: int, day_index: int) -> ModuleType:
+    """
+    Import the module of the given year and day.
     """
 
     # check that the module exists
     if not os.path.exists(f"{year_index}/src/day_{day_index}.py"):
         raise ValueError(f"Year {year_index}, day {day_index} module not found.")
 
-    module = importlib.import_module(f"{year_index}.src.day_{day_index}")
+    return importlib.import_module(f"{year_index}.src.day_{day_index}")
+
+
+def run_day(year_index: int, day_index: int, part: int) -> Callable:
+    """'
+    Programmatically run the challenge for the given year, day and part.
+    """
+
+    module = load_module(year_index, day_index)
     if part == 1:
         return module.part_1
     elif part == 2:
@@ -29,8 +40,319 @@ def run_day(year_index: int, day_index: int, part: int) -> Callable:
         raise ValueError("Invalid part selected.")
 
 
+def get_input_path(year_index: int, day_index: int, test: bool) -> str:
+    """
+    Return the path of the input file of the given year and day.
+    """
+    file_path = (
+        f"{year_index}/inputs/day_{day_index}_input"
+        + ("_test" if test else "")
+        + ".txt"
+    )
+
+    if not os.path.exists(file_path):
+        raise ValueError(f"File not found: {file_path}")
+
+    return file_path
+
+
+def configure_logger(debug: bool) -> None:
+    """
+    Configure loguru logger based on debug flag.
+    When debug is False, no handler is added, so logs are suppressed.
+    """
+    logger.remove()  # Remove default handler
+    if debug:
+        logger.add(
+            sys.stderr,
+            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            level="DEBUG",
+            colorize=True,
+        )
+
+
+def check(argv: list[str]) -> None:
+    """
+    Check the registered implementations of a part against each other.
+    """
+    from harness import DEFAULT_SIZES, run_differential
+
+    argsparse = argparse.ArgumentParser(prog="aoc check")
+    argsparse.add_argument(
+        "--year", type=int, help="The year of the challenge to check.", required=True
+    )
+    argsparse.add_argument(
+        "--day", type=int, help="The day of the challenge to check.", required=True
+    )
+    argsparse.add_argument(
+        "--part", type=int, help="The part of the challenge to check.", required=True
+    )
+    argsparse.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="The sizes of the generated inputs.",
+    )
+    argsparse.add_argument(
+        "--seed", type=int, default=0, help="The seed of the input generator."
+    )
+    argsparse.add_argument(
+        "--debug",
+        help="Enable debug logging with loguru.",
+        action="store_true",
+    )
+
+    args = argsparse.parse_args(argv)
+    configure_logger(args.debug)
+
+    comparisons, mismatch = run_differential(
+        args.year, args.day, args.part, tuple(args.sizes), args.seed
+    )
+    for comparison in comparisons:
+        print(comparison)
+
+    if mismatch is not None:
+        print(
+            f"First disagreeing input: {mismatch.input_path} "
+            f"({', '.join(mismatch.disagreeing)})"
+        )
+        sys.exit(1)
+
+
+def bench(argv: list[str]) -> None:
+    """
+    Run a part several times and report the run time and GC activity of each run.
+    """
+    from batch import Job, JobResult
+    from metrics import write_metrics
+
+    argsparse = argparse.ArgumentParser(prog="aoc bench")
+    argsparse.add_argument(
+        "--year", type=int, help="The year of the challenge to run.", required=True
+    )
+    argsparse.add_argument(
+        "--day", type=int, help="The day of the challenge to run.", required=True
+    )
+    argsparse.add_argument(
+        "--part", type=int, help="The part of the challenge to run.", required=True
+    )
+    argsparse.add_argument(
+        "--test",
+        help="Run the test cases for the challenge.",
+        action="store_true",
+    )
+    argsparse.add_argument(
+        "--repeat", type=int, default=5, help="The number of runs to measure."
+    )
+    argsparse.add_argument(
+        "--gc",
+        choices=GC_MODES,
+        default="default",
+        help="The garbage collector mode used during the solve.",
+    )
+    argsparse.add_argument(
+        "--metrics",
+        default=None,
+        help="Write the measurements to this file in the Prometheus text format.",
+    )
+
+    args = argsparse.parse_args(argv)
+    configure_logger(False)
+
+    file_path = get_input_path(args.year, args.day, args.test)
+    solver = run_day(args.year, args.day, args.part)
+    job = Job(args.year, args.day, args.part, file_path)
+
+    results = []
+    for i in range(args.repeat):
+        measurement = measure(solver, file_path, args.gc)
+        results.append(JobResult(job, measurement=measurement))
+        print(f"Run {i + 1}: {measurement}")
+
+    if args.metrics is not None:
+        write_metrics(results, args.metrics)
+
+
+def run_all(argv: list[str]) -> None:
+    """
+    Run every part of a year, or of a day against several inputs, in a batch.
+    """
+    from batch import discover_jobs, run_jobs
+    from metrics import write_metrics
+    from tracing import Tracer
+
+    argsparse = argparse.ArgumentParser(prog="aoc run-all")
+    argsparse.add_argument(
+        "--year", type=int, help="The year of the challenges to run.", required=True
+    )
+    argsparse.add_argument(
+        "--day", type=int, help="Only run this day of the challenges.", default=None
+    )
+    argsparse.add_argument(
+        "--inputs",
+        nargs="+",
+        default=None,
+        help="Run the day against these input files instead of its own input.",
+    )
+    argsparse.add_argument(
+        "--test",
+        help="Run the test cases for the challenges.",
+        action="store_true",
+    )
+    argsparse.add_argument(
+        "--jobs", type=int, default=1, help="The number of worker processes."
+    )
+    argsparse.add_argument(
+        "--gc",
+        choices=GC_MODES,
+        default="default",
+        help="The garbage collector mode used during the solves.",
+    )
+    argsparse.add_argument(
+        "--trace",
+        default=None,
+        help="Write a Chrome trace-event JSON timeline of the runner phases to this file.",
+    )
+    argsparse.add_argument(
+        "--metrics",
+        default=None,
+        help="Write the measurements to this file in the Prometheus text format.",
+    )
+
+    args = argsparse.parse_args(argv)
+    configure_logger(False)
+
+    tracer = Tracer(enabled=args.trace is not None)
+    jobs = discover_jobs(args.year, args.day, args.test, args.inputs)
+    results = run_jobs(jobs, args.jobs, args.gc, tracer)
+
+    for result in results:
+        print(result)
+
+    if args.trace is not None:
+        tracer.write(args.trace)
+    if args.metrics is not None:
+        write_metrics(results, args.metrics)
+
+
+def enqueue(argv: list[str]) -> None:
+    """
+    Add the jobs of a year, or of a day against several inputs, to a shared queue.
+    """
+    from batch import discover_jobs
+    from work_queue import enqueue_jobs
+
+    argsparse = argparse.ArgumentParser(prog="aoc enqueue")
+    argsparse.add_argument("--queue", help="The shared queue directory.", required=True)
+    argsparse.add_argument(
+        "--year", type=int, help="The year of the challenges to run.", required=True
+    )
+    argsparse.add_argument(
+        "--day", type=int, help="Only run this day of the challenges.", default=None
+    )
+    argsparse.add_argument(
+        "--inputs",
+        nargs="+",
+        default=None,
+        help="Run the day against these input files instead of its own input.",
+    )
+    argsparse.add_argument(
+        "--test",
+        help="Run the test cases for the challenges.",
+        action="store_true",
+    )
+
+    args = argsparse.parse_args(argv)
+    jobs = discover_jobs(args.year, args.day, args.test, args.inputs)
+    print(f"Enqueued {enqueue_jobs(args.queue, jobs)} jobs in {args.queue}.")
+
+
+def worker(argv: list[str]) -> None:
+    """
+    Solve jobs from a shared queue until it is empty.
+    """
+    from work_queue import run_worker
+
+    argsparse = argparse.ArgumentParser(prog="aoc worker")
+    argsparse.add_argument("--queue", help="The shared queue directory.", required=True)
+    argsparse.add_argument(
+        "--gc",
+        choices=GC_MODES,
+        default="default",
+        help="The garbage collector mode used during the solves.",
+    )
+    argsparse.add_argument(
+        "--stale-after",
+        type=float,
+        default=None,
+        help="Once the queue is empty, requeue the jobs claimed more than this "
+        "many seconds ago by workers that may have crashed.",
+    )
+
+    args = argsparse.parse_args(argv)
+    configure_logger(False)
+
+    for result in run_worker(args.queue, args.gc, args.stale_after):
+        print(result)
+
+
+def collect(argv: list[str]) -> None:
+    """
+    Aggregate the results written to a shared queue by the workers.
+    """
+    from metrics import write_metrics
+    from work_queue import collect_results, requeue_stale_claims
+
+    argsparse = argparse.ArgumentParser(prog="aoc collect")
+    argsparse.add_argument("--queue", help="The shared queue directory.", required=True)
+    argsparse.add_argument(
+        "--metrics",
+        default=None,
+        help="Write the measurements to this file in the Prometheus text format.",
+    )
+    argsparse.add_argument(
+        "--stale-after",
+        type=float,
+        default=None,
+        help="Requeue the jobs claimed more than this many seconds ago by workers "
+        "that may have crashed.",
+    )
+
+    args = argsparse.parse_args(argv)
+    if args.stale_after is not None:
+        n_requeued = requeue_stale_claims(args.queue, args.stale_after)
+        print(f"Requeued {n_requeued} stale jobs.")
+    results, n_pending, n_claimed = collect_results(args.queue)
+
+    for result in results:
+        print(result)
+    n_failed = sum(result.failed for result in results)
+    print(
+        f"{len(results)} results ({n_failed} failed), "
+        f"{n_claimed} in progress, {n_pending} pending."
+    )
+
+    if args.metrics is not None:
+        write_metrics(results, args.metrics)
+
+
+COMMANDS: dict[str, Callable[[list[str]], None]] = {
+    "bench": bench,
+    "check": check,
+    "collect": collect,
+    "enqueue": enqueue,
+    "run-all": run_all,
+    "worker": worker,
+}
+
+
 def main():
     """Main entry point for the aoc script."""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     argsparse = argparse.ArgumentParser()
     argsparse.add_argument(
         "--year", type=int, help="The year of the challenge to run.", required=True
@@ -51,6 +373,12 @@ def main():
         help="Enable debug logging with loguru.",
         action="store_true",
     )
+    argsparse.add_argument(
+        "--gc",
+        choices=GC_MODES,
+        default="default",
+        help="The garbage collector mode used during the solve.",
+    )
 
     args = argsparse.parse_args()
     year = args.year
@@ -59,25 +387,15 @@ def main():
     test = args.test
     debug = args.debug
 
-    # Configure loguru logger based on debug flag
-    logger.remove()  # Remove default handler
-    if debug:
-        logger.add(
-            sys.stderr,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            level="DEBUG",
-            colorize=True,
-        )
-        logger.debug(f"Debug mode enabled. Running year {year}, day {day}, part {part}")
-    # When debug is False, no handler is added, so logs are suppressed
-
-    file_path = f"{year}/inputs/day_{day}_input" + ("_test" if test else "") + ".txt"
+    configure_logger(debug)
+    logger.debug(f"Debug mode enabled. Running year {year}, day {day}, part {part}")
 
-    if not os.path.exists(file_path):
-        raise ValueError(f"File not found: {file_path}")
+    file_path = get_input_path(year, day, test)
 
     logger.debug(f"Input file: {file_path}")
-    result = run_day(year, day, part)(file_path)
+    solver = run_day(year, day, part)
+    with gc_mode(args.gc):
+        result = solver(file_path)
     logger.debug(f"Result: {result}")
     print(result)
 
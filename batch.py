@@ -0,0 +1,193 @@
+"""
+Batch execution of (year, day, part, input) jobs, optionally across a pool of
+worker processes.
+"""
+
+import contextlib
+import glob
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Optional
+
+from aoc import get_input_path, run_day
+from instrumentation import Measurement, measure
+from tracing import Tracer, now_us
+
+
+class Job:
+    year: int
+    day: int
+    part: int
+    input_path: str
+
+    def __init__(self, year: int, day: int, part: int, input_path: str):
+        self.year = year
+        self.day = day
+        self.part = part
+        self.input_path = input_path
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "year": self.year,
+            "day": self.day,
+            "part": self.part,
+            "input_path": self.input_path,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        return cls(data["year"], data["day"], data["part"], data["input_path"])
+
+    def __str__(self) -> str:
+        return f"{self.year} day {self.day} part {self.part} ({self.input_path})"
+
+
+class JobResult:
+    job: Job
+    measurement: Optional[Measurement]
+    error: Optional[str]
+    events: list[dict[str, Any]]
+
+    def __init__(
+        self,
+        job: Job,
+        measurement: Optional[Measurement] = None,
+        error: Optional[str] = None,
+        events: Optional[list[dict[str, Any]]] = None,
+    ):
+        self.job = job
+        self.measurement = measurement
+        self.error = error
+        self.events = events or []
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Serialise the result, without its trace events.
+        """
+        return {
+            "job": self.job.to_dict(),
+            "measurement": (
+                self.measurement.to_dict() if self.measurement is not None else None
+            ),
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "JobResult":
+        measurement = data["measurement"]
+        return cls(
+            Job.from_dict(data["job"]),
+            Measurement.from_dict(measurement) if measurement is not None else None,
+            data["error"],
+        )
+
+    def __str__(self) -> str:
+        if self.measurement is None:
+            return f"{self.job}: FAILED {self.error}"
+        return f"{self.job}: {self.measurement}"
+
+
+def discover_jobs(
+    year: int,
+    day: Optional[int] = None,
+    test: bool = False,
+    inputs: Optional[list[str]] = None,
+) -> list[Job]:
+    """
+    List the jobs of a year, or of a single day.
+
+    Without explicit inputs, every day module with an input file is run on it.
+    With explicit inputs, every part of the day is run on each of them.
+    """
+
+    if inputs:
+        if day is None:
+            raise ValueError("Explicit inputs require a day.")
+        return [Job(year, day, part, path) for path in inputs for part in (1, 2)]
+
+    if day is not None:
+        days = [day]
+    else:
+        days = sorted(
+            int(re.search(r"day_(\d+)\.py$", path).group(1))
+            for path in glob.glob(f"{year}/src/day_*.py")
+        )
+
+    jobs = []
+    for day_index in days:
+        try:
+            input_path = get_input_path(year, day_index, test)
+        except ValueError:
+            continue
+        jobs.extend(Job(year, day_index, part, input_path) for part in (1, 2))
+    return jobs
+
+
+def run_job(job: Job, gc: str = "default", trace: bool = False) -> JobResult:
+    """
+    Import and solve a single job. Runs in a worker process when the batch is
+    parallel, so the trace events are returned with the result.
+    """
+    tracer = Tracer(enabled=trace)
+    args = {"year": job.year, "day": job.day, "part": job.part, "input": job.input_path}
+
+    with tracer.span(f"{job.year}/{job.day}/{job.part}", "job", args):
+        try:
+            with tracer.span("import", "phase", args):
+                solver = run_day(job.year, job.day, job.part)
+            with tracer.span("solve", "phase", args):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    measurement = measure(solver, job.input_path, gc)
+        except Exception as error:
+            return JobResult(job, error=repr(error), events=tracer.events)
+
+    return JobResult(job, measurement=measurement, events=tracer.events)
+
+
+def run_jobs(
+    jobs: list[Job],
+    n_workers: int = 1,
+    gc: str = "default",
+    tracer: Optional[Tracer] = None,
+) -> list[JobResult]:
+    """
+    Run the jobs sequentially, or across `n_workers` processes.
+    Results are returned in the order of the jobs.
+    """
+
+    tracer = tracer or Tracer(enabled=False)
+    tracer.name_process("runner")
+
+    if n_workers <= 1:
+        results = [run_job(job, gc, tracer.enabled) for job in jobs]
+        for result in results:
+            tracer.extend(result.events)
+        return results
+
+    results_by_index: dict[int, JobResult] = {}
+    worker_pids: set[int] = set()
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        with tracer.span("submit", "runner"):
+            futures = {
+                executor.submit(run_job, job, gc, tracer.enabled): i
+                for i, job in enumerate(jobs)
+            }
+
+        wait_start = now_us()
+        for future in as_completed(futures):
+            tracer.add_span("wait", "runner", wait_start, now_us())
+            result = future.result()
+            tracer.extend(result.events)
+            worker_pids.update(event["pid"] for event in result.events)
+            results_by_index[futures[future]] = result
+            wait_start = now_us()
+
+    for i, pid in enumerate(sorted(worker_pids)):
+        tracer.name_process(f"worker {i + 1}", pid)
+
+    return [results_by_index[i] for i in range(len(jobs))]
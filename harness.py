@@ -0,0 +1,175 @@
+"""
+Differential testing harness for Advent of Code solutions.
+
+A day module can register several implementations of a part, together with
+an input generator:
+
+IMPLEMENTATIONS = {
+    1: {"reference": part_1, "numpy": part_1_numpy},
+    2: {"reference": part_2, "numpy": part_2_numpy},
+}
+
+
+def generate_input(size: int, seed: int) -> str:
+    ...
+
+The first implementation registered for a part is the reference. Every other
+implementation is checked against it on generated inputs of increasing size.
+
+Example:
+python aoc.py check --year 2024 --day 11 --part 2 --sizes 10 100 1000
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+from aoc import load_module
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def load_implementations(
+    year: int, day: int, part: int
+) -> tuple[dict[str, Callable[[str], Any]], Callable[[int, int], str]]:
+    """
+    Return the registered implementations of a part and the input generator.
+    """
+
+    module = load_module(year, day)
+    implementations = getattr(module, "IMPLEMENTATIONS", {}).get(part, {})
+    generate_input = getattr(module, "generate_input", None)
+
+    if len(implementations) < 2:
+        raise ValueError(
+            f"Year {year}, day {day}, part {part} registers fewer than two implementations."
+        )
+    if generate_input is None:
+        raise ValueError(f"Year {year}, day {day} has no input generator.")
+
+    return implementations, generate_input
+
+
+class Comparison:
+    size: int
+    input_path: str
+    results: dict[str, Any]
+    timings: dict[str, float]
+    errors: dict[str, str]
+
+    def __init__(self, size: int, input_path: str):
+        self.size = size
+        self.input_path = input_path
+        self.results = {}
+        self.timings = {}
+        self.errors = {}
+
+    @property
+    def reference(self) -> str:
+        return next(iter(self.results))
+
+    @property
+    def disagreeing(self) -> list[str]:
+        """
+        Implementations whose result differs from the reference, or that raised.
+        When the reference raises, every implementation disagrees.
+        """
+        if self.reference in self.errors:
+            return list(self.results)
+        expected = self.results[self.reference]
+        return [
+            name
+            for name, result in self.results.items()
+            if name in self.errors or result != expected
+        ]
+
+    @property
+    def agrees(self) -> bool:
+        return not self.disagreeing
+
+    def speedup(self, name: str) -> float:
+        """
+        Ratio between the reference run time and the run time of `name`.
+        """
+        if self.reference in self.errors:
+            return float("nan")
+        if self.timings[name] == 0:
+            return float("inf")
+        return self.timings[self.reference] / self.timings[name]
+
+    def __str__(self) -> str:
+        lines = [f"size={self.size} ({self.input_path})"]
+        for name, result in self.results.items():
+            if name in self.errors:
+                lines.append(
+                    f"  {name:<16} {'':>11} {'':>9}  ERROR  {self.errors[name]}"
+                )
+                continue
+            status = "MISMATCH" if name in self.disagreeing else "ok"
+            lines.append(
+                f"  {name:<16} {self.timings[name]:>10.4f}s "
+                f"x{self.speedup(name):>8.2f}  {status}  result={result}"
+            )
+        return "\n".join(lines)
+
+
+def time_implementation(
+    implementation: Callable[[str], Any], file_path: str
+) -> tuple[Any, float]:
+    """
+    Run an implementation on a file and return its result and run time.
+    The solver output is discarded so that only the report is printed.
+    """
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = implementation(file_path)
+        elapsed = time.perf_counter() - start
+
+    return result, elapsed
+
+
+def run_differential(
+    year: int,
+    day: int,
+    part: int,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    seed: int = 0,
+) -> tuple[list[Comparison], Optional[Comparison]]:
+    """
+    Run every implementation of a part on generated inputs of increasing size.
+
+    Stops at the first input on which an implementation disagrees with the
+    reference, or raises, and returns it; its input file is kept on disk for
+    inspection.
+    """
+
+    implementations, generate_input = load_implementations(year, day, part)
+    work_dir = tempfile.mkdtemp(prefix=f"aoc_{year}_{day}_")
+
+    comparisons: list[Comparison] = []
+    for size in sorted(sizes):
+        input_path = os.path.join(work_dir, f"day_{day}_size_{size}.txt")
+        with open(input_path, "w") as file:
+            file.write(generate_input(size, seed))
+
+        comparison = Comparison(size, input_path)
+        for name, implementation in implementations.items():
+            try:
+                result, elapsed = time_implementation(implementation, input_path)
+            except Exception as error:
+                result, elapsed = None, 0.0
+                comparison.errors[name] = repr(error)
+            comparison.results[name] = result
+            comparison.timings[name] = elapsed
+
+        comparisons.append(comparison)
+        if not comparison.agrees:
+            return comparisons, comparison
+
+    shutil.rmtree(work_dir)
+    return comparisons, None
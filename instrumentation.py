@@ -0,0 +1,191 @@
+"""
+Instrumentation shared by the runner and the bench mode: garbage collector
+settings and per-run measurements.
+
+GC modes:
+- default: leave the garbage collector untouched.
+- off: disable the cyclic garbage collector during the solve.
+- freeze: move every object allocated so far (imports, module state) to the
+  permanent generation so that collections during the solve skip them.
+- tuned: freeze, then raise the generation thresholds so that solvers
+  allocating millions of small objects trigger far fewer collections.
+"""
+
+import contextlib
+import gc
+import re
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+GC_MODES = ("default", "off", "freeze", "tuned")
+TUNED_THRESHOLDS = (100_000, 50, 100)
+
+
+class GCMonitor:
+    """
+    Count the garbage collections and their total pause time using gc.callbacks.
+    """
+
+    collections: int
+    pause: float
+    _start: float
+
+    def __init__(self):
+        self.collections = 0
+        self.pause = 0.0
+        self._start = 0.0
+
+    def _callback(self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.collections += 1
+            self.pause += time.perf_counter() - self._start
+
+    def __enter__(self) -> "GCMonitor":
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        gc.callbacks.remove(self._callback)
+
+
+@contextlib.contextmanager
+def gc_mode(mode: str) -> Iterator[None]:
+    """
+    Apply a GC mode for the duration of the block and restore the previous
+    settings afterwards.
+    """
+
+    if mode not in GC_MODES:
+        raise ValueError(f"Invalid GC mode: {mode}")
+
+    was_enabled = gc.isenabled()
+    thresholds = gc.get_threshold()
+
+    if mode == "off":
+        gc.disable()
+    elif mode in ("freeze", "tuned"):
+        gc.freeze()
+        if mode == "tuned":
+            gc.set_threshold(*TUNED_THRESHOLDS)
+
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+        gc.set_threshold(*thresholds)
+        if was_enabled:
+            gc.enable()
+
+
+def reset_peak_memory() -> bool:
+    """
+    Reset the peak resident set size of the current process to its current
+    size, so that the next reading only covers what runs in between.
+    Only supported on Linux; return False elsewhere.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_memory() -> int:
+    """
+    Peak resident set size of the current process since the last reset, in
+    bytes.
+    """
+    try:
+        with open("/proc/self/status", "r") as file:
+            match = re.search(r"VmHWM:\s+(\d+) kB", file.read())
+        if match is not None:
+            return int(match.group(1)) * 1024
+    except OSError:
+        pass
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class Measurement:
+    result: Any
+    duration: float
+    gc_collections: int
+    gc_pause: float
+    peak_memory: int
+
+    def __init__(
+        self,
+        result: Any,
+        duration: float,
+        gc_collections: int,
+        gc_pause: float,
+        peak_memory: int,
+    ):
+        self.result = result
+        self.duration = duration
+        self.gc_collections = gc_collections
+        self.gc_pause = gc_pause
+        self.peak_memory = peak_memory
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "result": self.result,
+            "duration": self.duration,
+            "gc_collections": self.gc_collections,
+            "gc_pause": self.gc_pause,
+            "peak_memory": self.peak_memory,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Measurement":
+        return cls(
+            data["result"],
+            data["duration"],
+            data["gc_collections"],
+            data["gc_pause"],
+            data["peak_memory"],
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.duration:.4f}s | gc: {self.gc_collections} collections, "
+            f"{self.gc_pause * 1000:.2f}ms paused | "
+            f"peak memory: {self.peak_memory / 2**20:.1f}MiB | result={self.result}"
+        )
+
+
+def measure(
+    solver: Callable[[str], Any], file_path: str, mode: str = "default"
+) -> Measurement:
+    """
+    Run a solver on a file under the given GC mode and measure it.
+
+    The peak memory only covers the solve: the peak resident set size is reset
+    before it on Linux. Where it cannot be reset, the peak of the allocations
+    traced by tracemalloc during the solve is reported instead, at the cost of
+    a slower solve.
+    """
+
+    traced = not reset_peak_memory()
+    if traced:
+        tracemalloc.start()
+
+    try:
+        with gc_mode(mode), GCMonitor() as monitor:
+            start = time.perf_counter()
+            result = solver(file_path)
+            duration = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[1] if traced else peak_memory()
+    finally:
+        if traced:
+            tracemalloc.stop()
+
+    return Measurement(result, duration, monitor.collections, monitor.pause, memory)
@@ -0,0 +1,92 @@
+"""
+Metrics of the runner in the Prometheus text exposition format.
+
+The file is written atomically so that it can be scraped at any time, for
+instance by the node exporter textfile collector.
+"""
+
+import os
+from typing import Iterable
+
+from batch import JobResult
+
+DURATION_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0, 60.0, 600.0)
+
+
+def _labels(year: int, day: int, part: int, **extra: str) -> str:
+    labels = {"year": str(year), "day": str(day), "part": str(part), **extra}
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def format_metrics(results: Iterable[JobResult]) -> str:
+    """
+    Aggregate job results per (year, day, part) into Prometheus metrics.
+    """
+
+    durations: dict[tuple[int, int, int], list[float]] = {}
+    peak_memory: dict[tuple[int, int, int], int] = {}
+    gc_pause: dict[tuple[int, int, int], float] = {}
+    failures: dict[tuple[int, int, int], int] = {}
+
+    for result in results:
+        key = (result.job.year, result.job.day, result.job.part)
+        durations.setdefault(key, [])
+        failures.setdefault(key, 0)
+        if result.measurement is None:
+            failures[key] += 1
+            continue
+        durations[key].append(result.measurement.duration)
+        peak_memory[key] = max(peak_memory.get(key, 0), result.measurement.peak_memory)
+        gc_pause[key] = gc_pause.get(key, 0.0) + result.measurement.gc_pause
+
+    lines = [
+        "# HELP aoc_solve_duration_seconds Time spent solving a part.",
+        "# TYPE aoc_solve_duration_seconds histogram",
+    ]
+    for key, values in sorted(durations.items()):
+        for bucket in DURATION_BUCKETS:
+            count = sum(1 for value in values if value <= bucket)
+            lines.append(
+                f"aoc_solve_duration_seconds_bucket{{{_labels(*key, le=str(bucket))}}} {count}"
+            )
+        lines.append(
+            f"aoc_solve_duration_seconds_bucket{{{_labels(*key, le='+Inf')}}} {len(values)}"
+        )
+        lines.append(f"aoc_solve_duration_seconds_sum{{{_labels(*key)}}} {sum(values)}")
+        lines.append(
+            f"aoc_solve_duration_seconds_count{{{_labels(*key)}}} {len(values)}"
+        )
+
+    lines += [
+        "# HELP aoc_gc_pause_seconds_total Time spent in garbage collections while solving a part.",
+        "# TYPE aoc_gc_pause_seconds_total counter",
+    ]
+    for key, value in sorted(gc_pause.items()):
+        lines.append(f"aoc_gc_pause_seconds_total{{{_labels(*key)}}} {value}")
+
+    lines += [
+        "# HELP aoc_peak_memory_bytes Peak memory used while solving a part.",
+        "# TYPE aoc_peak_memory_bytes gauge",
+    ]
+    for key, value in sorted(peak_memory.items()):
+        lines.append(f"aoc_peak_memory_bytes{{{_labels(*key)}}} {value}")
+
+    lines += [
+        "# HELP aoc_solve_failures_total Number of solves that raised an exception.",
+        "# TYPE aoc_solve_failures_total counter",
+    ]
+    for key, value in sorted(failures.items()):
+        lines.append(f"aoc_solve_failures_total{{{_labels(*key)}}} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(results: Iterable[JobResult], file_path: str) -> None:
+    """
+    Write the metrics file, replacing the previous one atomically.
+    """
+
+    temporary_path = f"{file_path}.tmp"
+    with open(temporary_path, "w") as file:
+        file.write(format_metrics(results))
+    os.replace(temporary_path, file_path)
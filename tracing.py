@@ -0,0 +1,92 @@
+"""
+Timeline of the runner phases in the Chrome trace-event JSON format.
+
+The output can be opened in chrome://tracing or https://ui.perfetto.dev.
+Each process (the main runner and every worker) gets its own lane.
+"""
+
+import contextlib
+import json
+import os
+import time
+from typing import Any, Iterator, Optional
+
+
+def now_us() -> int:
+    """
+    Wall-clock timestamp in microseconds, comparable across processes.
+    """
+    return time.time_ns() // 1000
+
+
+class Tracer:
+    events: list[dict[str, Any]]
+    enabled: bool
+
+    def __init__(self, enabled: bool = True):
+        self.events = []
+        self.enabled = enabled
+
+    def name_process(self, name: str, pid: Optional[int] = None) -> None:
+        """
+        Label the lane of a process, the current one by default.
+        """
+        if self.enabled:
+            self.events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid or os.getpid(),
+                    "tid": 0,
+                    "args": {"name": name},
+                }
+            )
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start: int,
+        end: int,
+        args: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Record a complete event between two timestamps in microseconds.
+        """
+        if self.enabled:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": end - start,
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": args or {},
+                }
+            )
+
+    @contextlib.contextmanager
+    def span(
+        self, name: str, category: str, args: Optional[dict[str, Any]] = None
+    ) -> Iterator[None]:
+        """
+        Record the block as a complete event.
+        """
+        start = now_us()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start, now_us(), args)
+
+    def extend(self, events: list[dict[str, Any]]) -> None:
+        """
+        Merge the events recorded by another process.
+        """
+        if self.enabled:
+            self.events.extend(events)
+
+    def write(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,174 @@
+"""
+Distributed run-all through a work queue on a shared directory.
+
+Layout of the queue directory:
+- pending/<job_id>.json: jobs waiting for a worker. Job ids are unique, so
+  that several enqueuers never overwrite each other's jobs.
+- claimed/<job_id>.json: jobs being solved. A worker claims a job by renaming
+  it from pending/, which is atomic on a single filesystem, so exactly one
+  worker wins each job. The claim is then stamped with the time and worker, so
+  that the claims of crashed workers can be moved back to pending/.
+- results/<job_id>.json: results, written to a temporary file then renamed.
+
+Example:
+python aoc.py enqueue --queue /shared/queue --year 2024
+python aoc.py worker --queue /shared/queue  # on every machine
+python aoc.py collect --queue /shared/queue
+"""
+
+import contextlib
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Iterator, Optional
+
+from batch import Job, JobResult, run_job
+
+PENDING = "pending"
+CLAIMED = "claimed"
+RESULTS = "results"
+
+
+def _make_dirs(queue_dir: str) -> None:
+    for sub_dir in (PENDING, CLAIMED, RESULTS):
+        os.makedirs(os.path.join(queue_dir, sub_dir), exist_ok=True)
+
+
+def _write_json(file_path: str, data: dict) -> None:
+    """
+    Write a JSON file so that readers never see it partially written.
+    """
+    temporary_path = f"{file_path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(data, file, default=str)
+    os.replace(temporary_path, file_path)
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _job_files(directory: str) -> list[str]:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+
+
+def enqueue_jobs(queue_dir: str, jobs: list[Job]) -> int:
+    """
+    Add jobs to the queue. Input paths are made absolute so that workers
+    started from another directory or machine find the same files.
+    """
+
+    _make_dirs(queue_dir)
+    # ordered by enqueue time, unique across concurrent enqueuers
+    batch_id = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}"
+
+    for i, job in enumerate(jobs):
+        job_id = f"{batch_id}_{i:06d}_{job.year}_{job.day}_{job.part}"
+        job = Job(job.year, job.day, job.part, os.path.abspath(job.input_path))
+        _write_json(os.path.join(queue_dir, PENDING, f"{job_id}.json"), job.to_dict())
+
+    return len(jobs)
+
+
+def claim_job(queue_dir: str) -> Optional[tuple[str, Job]]:
+    """
+    Claim the next pending job. Return None when the queue is empty.
+    """
+
+    pending_dir = os.path.join(queue_dir, PENDING)
+    for name in _job_files(pending_dir):
+        claimed_path = os.path.join(queue_dir, CLAIMED, name)
+        try:
+            os.rename(os.path.join(pending_dir, name), claimed_path)
+        except FileNotFoundError:
+            # another worker claimed it first
+            continue
+
+        with open(claimed_path, "r") as file:
+            data = json.load(file)
+        data["claimed_at"] = time.time()
+        data["worker"] = _worker_id()
+        _write_json(claimed_path, data)
+        return name[: -len(".json")], Job.from_dict(data)
+
+    return None
+
+
+def requeue_stale_claims(queue_dir: str, max_age: float) -> int:
+    """
+    Move the jobs claimed more than `max_age` seconds ago back to pending/,
+    assuming their worker crashed. `max_age` must exceed the longest solve,
+    otherwise a job still being solved is solved twice.
+    Return the number of requeued jobs.
+    """
+
+    _make_dirs(queue_dir)
+    now = time.time()
+    n_requeued = 0
+    for name in _job_files(os.path.join(queue_dir, CLAIMED)):
+        claimed_path = os.path.join(queue_dir, CLAIMED, name)
+        try:
+            with open(claimed_path, "r") as file:
+                claimed_at = json.load(file).get("claimed_at")
+            # not stamped yet, use the time of the rename
+            if claimed_at is None:
+                claimed_at = os.path.getctime(claimed_path)
+            if now - claimed_at <= max_age:
+                continue
+            os.rename(claimed_path, os.path.join(queue_dir, PENDING, name))
+        except (FileNotFoundError, json.JSONDecodeError):
+            # completed, requeued by someone else, or being stamped
+            continue
+        n_requeued += 1
+
+    return n_requeued
+
+
+def complete_job(queue_dir: str, job_id: str, result: JobResult) -> None:
+    _write_json(os.path.join(queue_dir, RESULTS, f"{job_id}.json"), result.to_dict())
+    # the claim may have been requeued meanwhile
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(os.path.join(queue_dir, CLAIMED, f"{job_id}.json"))
+
+
+def run_worker(
+    queue_dir: str, gc: str = "default", stale_after: Optional[float] = None
+) -> Iterator[JobResult]:
+    """
+    Claim and solve jobs until the queue is empty.
+    With `stale_after`, claims older than that many seconds are requeued
+    whenever no job is pending, so that the jobs of crashed workers are solved.
+    """
+
+    _make_dirs(queue_dir)
+    while True:
+        claimed = claim_job(queue_dir)
+        if claimed is None and stale_after is not None:
+            if requeue_stale_claims(queue_dir, stale_after):
+                continue
+        if claimed is None:
+            return
+
+        job_id, job = claimed
+        result = run_job(job, gc)
+        complete_job(queue_dir, job_id, result)
+        yield result
+
+
+def collect_results(queue_dir: str) -> tuple[list[JobResult], int, int]:
+    """
+    Read every result of the queue.
+    Also return the number of jobs still pending and being solved.
+    """
+
+    _make_dirs(queue_dir)
+    results = []
+    for name in _job_files(os.path.join(queue_dir, RESULTS)):
+        with open(os.path.join(queue_dir, RESULTS, name), "r") as file:
+            results.append(JobResult.from_dict(json.load(file)))
+
+    n_pending = len(_job_files(os.path.join(queue_dir, PENDING)))
+    n_claimed = len(_job_files(os.path.join(queue_dir, CLAIMED)))
+    return results, n_pending, n_claimed